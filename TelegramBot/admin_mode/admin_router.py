@@ -5,6 +5,13 @@ from TelegramBot.middleware.middlewares import IsAdmin
 from TelegramBot.utils.log_message import log_message
 
 from data.async_database import AdminDB
+from TelegramBot.conference_mode.utils.search_cache import search_cache
+from TelegramBot.conference_mode.utils.local_search import event_search
+from TelegramBot.conference_mode.conference_routers.gaianet_sql import sql_generation_stats
+from TelegramBot.utils.llm_scheduler import llm_scheduler
+from TelegramBot.utils.gaianet_client import gaianet_breaker
+from TelegramBot.middleware.antiflood import message_limiter, callback_limiter
+from TelegramBot.utils.update_isolation import update_isolation
 
 # Initialize the router and AdminDB instance
 router = Router()
@@ -41,4 +48,86 @@ async def get_average_request(message: Message):
 
     msg = f'Average requests: {average_request}'
 
-    return await message.answer(text=msg)
\ No newline at end of file
+    return await message.answer(text=msg)
+
+
+@router.message(IsAdmin(), lambda message: message.text.lower() == 'search cache')
+async def get_search_cache_stats(message: Message):
+    """
+    Handle 'search cache' command for admin users.
+
+    This function sends how many free-text queries the local search answered,
+    the hit rate of the search cache for the rest and the LLM time it saved.
+
+    :param message: The message object from the Telegram user (admin)
+    """
+    stats = search_cache.stats()
+    local_stats = event_search.stats()
+    calls = sql_generation_stats['calls'] or 1
+
+    msg = f"""Local search: {local_stats['answered']} answered, {local_stats['passed_to_llm']} passed to LLM
+
+Search cache
+Entries: {stats['size']}
+Hits: {stats['hits']} (SQL reused: {stats['sql_hits']})
+Misses: {stats['misses']}
+Coalesced: {stats['coalesced']}
+Hit rate: {stats['hit_rate']:.1%}
+Saved LLM time: {stats['saved_seconds']:.1f} s
+
+SQL generation: {sql_generation_stats['calls']} calls
+Average prompt: {sql_generation_stats['prompt_chars'] // calls} chars
+Average LLM time: {sql_generation_stats['seconds'] / calls:.1f} s"""
+
+    return await message.answer(text=msg)
+
+
+@router.message(IsAdmin(), lambda message: message.text.lower() == 'llm queue')
+async def get_llm_queue_stats(message: Message):
+    """
+    Handle 'llm queue' command for admin users.
+
+    This function sends the state of the LLM request queue and of the Gaianet circuit breaker.
+
+    :param message: The message object from the Telegram user (admin)
+    """
+    stats = llm_scheduler.stats()
+    breaker = gaianet_breaker.stats()
+
+    msg = f"""LLM queue
+Queued: {stats['queued_interactive']} interactive, {stats['queued_background']} background
+Running: {stats['running']}
+Completed: {stats['completed']}
+Rejected: {stats['rejected']}
+Expired: {stats['expired']}
+Longest wait: {stats['max_wait_seen']:.1f} s
+
+Gaianet circuit: {breaker['state']}
+Recent failure rate: {breaker['failure_rate']:.0%} of {breaker['recent_calls']} calls
+Rejected while open: {breaker['rejected']}"""
+
+    return await message.answer(text=msg)
+
+
+@router.message(IsAdmin(), lambda message: message.text.lower() == 'antiflood')
+async def get_antiflood_stats(message: Message):
+    """
+    Handle 'antiflood' command for admin users.
+
+    This function sends the counters of the anti-flood limiters of messages and callback queries
+    and the state of the per-user update queues.
+
+    :param message: The message object from the Telegram user (admin)
+    """
+    lines = ['Antiflood']
+    for name, limiter in (('Messages', message_limiter), ('Callbacks', callback_limiter)):
+        stats = limiter.stats()
+        lines.append(f"{name} ({limiter.limit} per {int(limiter.window)} s): {stats['allowed']} allowed, "
+                     f"{stats['limited']} limited, {stats['keys']} users tracked, {stats['evicted']} evicted")
+
+    updates = update_isolation.stats()
+    lines.append(f"Updates: {updates['running']} running (max {update_isolation.concurrency}), "
+                 f"{updates['users']} users active, {updates['handled']} handled, "
+                 f"longest user queue {updates['max_pending']}")
+
+    return await message.answer(text='\n'.join(lines))
@@ -1,18 +1,26 @@
 import asyncio
 from aiogram import Dispatcher, Bot, Router
-from aiogram.fsm.storage.memory import MemoryStorage
 
 from TelegramBot.conference_mode.notification.notification_new_update import start_check_update_events
 from TelegramBot.settings.config import BOT_TOKEN
+from data.async_database import log_sink
+from data.event_catalog import event_catalog, start_refresh_catalog
+from TelegramBot.conference_mode.utils.summary_cache import start_warm_up_summaries
+from TelegramBot.utils.admin_alerts import start_admin_alerts
+from TelegramBot.utils.update_isolation import update_isolation
+from TelegramBot.utils.fsm_storage import fsm_storage, start_clean_fsm_states
+from TelegramBot.conference_mode.utils.result_store import start_clean_result_sets
 
 from TelegramBot.conference_mode.handlers import main_handlers
 from TelegramBot import main_router
 from TelegramBot.conference_mode.conference_routers import conference
 from TelegramBot.admin_mode import admin_router
 from TelegramBot.conference_mode.callbacks import main_callbacks
-from TelegramBot.middleware.antiflood import AntiFloodMiddleware
+from TelegramBot.middleware.antiflood import AntiFloodMiddleware, message_limiter, callback_limiter
 from TelegramBot.middleware.log_message import LoggingMiddleware
 from TelegramBot.middleware.check_private_chat import PrivateChatFilterMiddleware
+from TelegramBot.middleware.middlewares import UserModeMiddleware
+from TelegramBot.middleware.fsm_flush import FSMFlushMiddleware
 
 from TelegramBot.conference_mode.notification import notificatin_new_event
 from TelegramBot.conference_mode.notification import notification_new_update
@@ -27,31 +35,71 @@ async def main():
     """
     Main function to start the bot and handle notifications for new and updated events.
     This function gathers the bot's main execution loop and notification checks for new and updated events.
+    The event catalog is loaded into memory first and refreshed in the background,
+    AI summaries of new and updated events are generated in the background as well.
+    Updates of one user are handled in order, updates of different users in parallel (see UserOrderedIsolation).
     """
     bot = Bot(BOT_TOKEN)
-    dp = Dispatcher()
+    dp = Dispatcher(storage=fsm_storage, events_isolation=update_isolation)
+    log_sink.start()  # Background writer for log rows
+    await event_catalog.load()  # Load the event catalog into memory
 
     await asyncio.gather(
         run_bot(bot=bot, dp=dp),
-        notificatin_new_event.start_check_new_event(bot=bot),
-        start_check_update_events(bot=bot)
+        start_refresh_catalog(),
+        start_admin_alerts(bot=bot),
+        *leader_jobs(bot=bot)
     )
 
 
+def leader_jobs(bot: Bot) -> list:
+    """
+    Returns the background jobs that must run in only one process: notifications, summary generation
+    and the deletion of stale FSM states and expired result sets.
+    In webhook mode they are started by the elected leader (see run_as_leader).
+
+    :param bot: The bot instance used to send notifications.
+    :return: List of coroutines
+    """
+    return [
+        start_warm_up_summaries(),
+        notificatin_new_event.start_check_new_event(bot=bot),
+        start_check_update_events(bot=bot),
+        start_clean_fsm_states(),
+        start_clean_result_sets(),
+    ]
+
+
 async def run_bot(bot: Bot, dp: Dispatcher):
     """
-    Runs the bot, sets up middlewares, and includes all routers for handling commands and callbacks.
+    Runs the bot with long polling.
 
     :param bot: The bot instance to run.
     :param dp: The dispatcher instance to handle updates and middleware.
     """
-    storage = MemoryStorage()
+    setup_dispatcher(dp=dp)
+
+    # Deleting webhook and starting polling
+    await bot.delete_webhook(drop_pending_updates=True)
+    print('Bot rolling')
+    await dp.start_polling(bot, handle_as_tasks=True)  # One task per update, ordered per user by the isolation
+
+
+def setup_dispatcher(dp: Dispatcher):
+    """
+    Sets up middlewares and includes all routers for handling commands and callbacks.
+    Shared by the polling (run_bot) and the webhook (webhook.py) modes.
+
+    :param dp: The dispatcher instance to handle updates and middleware.
+    """
     dp["dp"] = dp
-    dp["storage"] = storage
 
     # Adding middleware
+    dp.update.outer_middleware(FSMFlushMiddleware())  # Stores the FSM writes of an update once it is handled
+    dp.message.outer_middleware(UserModeMiddleware())  # Resolves the user's mode once per update for the filters
     dp.message.middleware(PrivateChatFilterMiddleware())
-    dp.message.middleware(AntiFloodMiddleware())
+    dp.message.middleware(AntiFloodMiddleware(limiter=message_limiter))
+    dp.callback_query.middleware(AntiFloodMiddleware(limiter=callback_limiter))
     dp.message.middleware(LoggingMiddleware())
 
     # Including routers for different bot functionalities
@@ -67,8 +115,3 @@ async def run_bot(bot: Bot, dp: Dispatcher):
         router_search_events,
         router_find_list,
     )
-
-    # Deleting webhook and starting polling
-    await bot.delete_webhook(drop_pending_updates=True)
-    print('Bot rolling')
-    await dp.start_polling(bot)
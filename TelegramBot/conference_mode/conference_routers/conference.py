@@ -13,19 +13,21 @@ from TelegramBot.utils.check_subscription import check_subscription
 from TelegramBot.conference_mode.defs_conference import generate_msg_events
 from TelegramBot.utils.coincidence import ContainsSubstringFilter
 from TelegramBot.conference_mode.keyboards import builders
-from TelegramBot.conference_mode.utils.pagination import PaginationEvent, paginator_event, get_msg_info_events, events_storage, events_storage_now_page, button_for_share_list
+from TelegramBot.conference_mode.utils.pagination import PaginationEvent, paginator_event, get_msg_info_events, button_for_share_list, EVENTS_ON_PAGE
+from TelegramBot.conference_mode.utils.result_store import result_store
 from TelegramBot.conference_mode.keyboards.builders import keyboard_for_add_or_remove_event
 from TelegramBot.utils.states import FindList
 from TelegramBot.utils.code_and_decode_key import code_secret_key, decode_secret_key
 
-from data.async_database import ListEvents, Event, UserDB
+from data.async_database import ListEvents, UserDB
+from data.event_catalog import event_catalog
 
 # Initialize router for conference mode
 router_conference = Router()
 router_conference.message.filter(UserModeFilter(mode='conference'))
 
 # Initialize database instances
-EventDB = Event()
+EventDB = event_catalog
 ListEventDB = ListEvents()
 UserDB = UserDB()
 
@@ -33,13 +35,19 @@ UserDB = UserDB()
 async def back_to_list_events(callback_query: CallbackQuery):
     """
     Handles returning to the list of events when 'Back to list' is clicked.
+    Returns to the page of the result set the user opened last.
     """
-    ids_events = events_storage[str(callback_query.from_user.id)]
-    msg_and_buttons = await get_msg_info_events(list_ids_event=ids_events)
-    msg = msg_and_buttons['msg']
     tg_id_user = callback_query.from_user.id
-    now_page = events_storage_now_page[str(tg_id_user)]
-    keyboard = await paginator_event(list_ids=ids_events, buttons=msg_and_buttons['buttons'], id_user=tg_id_user, page=now_page)
+    token = await result_store.last_token(id_user=tg_id_user)
+    session = await result_store.get(token=token, id_user=tg_id_user) if token else None
+    if session is None:
+        return await callback_query.answer(text='This list has expired, please search again', show_alert=True)
+    ids_events = session['ids']
+    now_page = session['page']
+    msg_and_buttons = await get_msg_info_events(list_ids_event=ids_events, skip=now_page * EVENTS_ON_PAGE,
+                                                limit=now_page * EVENTS_ON_PAGE + EVENTS_ON_PAGE)
+    msg = msg_and_buttons['msg']
+    keyboard = await paginator_event(list_ids=ids_events, buttons=msg_and_buttons['buttons'], id_user=tg_id_user, page=now_page, token=token)
     return await callback_query.message.edit_text(text=msg, reply_markup=keyboard, disable_web_page_preview=True,
                                                   parse_mode=ParseMode.MARKDOWN)
 
@@ -49,7 +57,8 @@ async def view_extened_info_about_event(callback_query: CallbackQuery):
     Handles displaying extended information about a specific event.
     """
     id_event = int(callback_query.data.split('_')[-1])
-    msg_text = await generate_msg_events.generate_extended_info_event(id_event=id_event)
+    msg_text = await generate_msg_events.generate_extended_info_event(id_event=id_event,
+                                                                      user_id=callback_query.from_user.id)
     keyboard = await builders.keyboard_choice_for_add_in_list(id_event=id_event, tg_id=callback_query.from_user.id)
     return callback_query.message.edit_text(text=msg_text, parse_mode=ParseMode.MARKDOWN, reply_markup=keyboard)
 
@@ -97,7 +106,7 @@ async def show_info_list(callback_query: CallbackQuery):
     id_list = re.search(pattern, callback_query.data).group('id_list')
     type_list = "public" if 'Pub' in callback_query.data else 'private'
     list_ids = await ListEventDB.get_list_event_ids_by_id_list(id_list=id_list, type_list=type_list)
-    msg_and_keyboard = await generate_msg_events.generate_info_many_events(list_ids_events=list_ids[0]['event_ids'])
+    msg_and_keyboard = await generate_msg_events.generate_info_many_events(list_ids_events=list_ids)
     msg = msg_and_keyboard['msg']
     keyboard = msg_and_keyboard['keyboard']
     return await callback_query.message.edit_text(text=msg, reply_markup=keyboard)
@@ -107,8 +116,7 @@ async def show_lists_events(message: Message):
     """
     Shows the list of private events for the user.
     """
-    list_ids = await ListEventDB.get_privete_lists_events_by_tg_id(tg_id_user=message.from_user.id)
-    list_ids = list_ids[0]['event_ids']
+    list_ids = await ListEventDB.get_private_list_event_ids_by_tg_id(tg_id_user=message.from_user.id)
     msg_and_buttons = await get_msg_info_events(list_ids_event=list_ids)
     msg = msg_and_buttons['msg']
     keyboard = await paginator_event(list_ids=list_ids, buttons=msg_and_buttons['buttons'], id_user=message.from_user.id, my_list=True)
@@ -170,6 +178,20 @@ async def add_list_in_favorit(callback_query: CallbackQuery):
     """
     list_id = int(callback_query.data.split('_')[-1])
     user_id = await UserDB.get_id_by_tg_id(tg_id=callback_query.from_user.id)
+    await UserDB.add_favorit_private_lists(id_user=user_id['id_user'], list_id=list_id)
+    return await callback_query.answer(text='List added to your favorites')
+
+@router_conference.callback_query(ContainsSubstringFilter('delete_list_in_my_favorit_'))
+async def delete_list_in_favorit(callback_query: CallbackQuery):
+    """
+    Removes the selected list from the user's favorites.
+    Handles the 'Delete from my favorites' button shown by find_list_by_key (conference_find_list.py)
+    for lists that are already in the favorites.
+    """
+    list_id = int(callback_query.data.split('_')[-1])
+    user_id = await UserDB.get_id_by_tg_id(tg_id=callback_query.from_user.id)
+    await UserDB.delete_favorit_private_lists(id_user=user_id['id_user'], list_id=list_id)
+    return await callback_query.answer(text='List removed from your favorites')
 
 @router_conference.message(F.text == '🔎Find list')
 async def find_list(message: Message, state: FSMContext):
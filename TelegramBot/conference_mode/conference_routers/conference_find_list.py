@@ -9,14 +9,15 @@ from TelegramBot.conference_mode.utils.pagination import paginator_event, get_ms
 from TelegramBot.utils.states import FindList
 from TelegramBot.utils.code_and_decode_key import decode_secret_key
 
-from data.async_database import ListEvents, Event, UserDB
+from data.async_database import ListEvents, UserDB
+from data.event_catalog import event_catalog
 
 # Initialize the router with a filter for the 'conference' mode
 router_find_list = Router()
 router_find_list.message.filter(UserModeFilter(mode='conference'))
 
 # Initialize database instances
-EventDB = Event()
+EventDB = event_catalog
 ListEventDB = ListEvents()
 UserDB = UserDB()
 
@@ -46,12 +47,10 @@ async def find_list_by_key(message: Message, state: FSMContext):
     if not list_event:
         return await message.answer(text='Not found, please enter again')
 
-    # Extract event IDs from the list and get the event information
-    list_ids = list_event[0]['event_ids']
-    msg_and_buttons = await get_msg_info_events(list_ids_event=list_ids)
-
-    # Extract list ID and message to be displayed
+    # Extract list ID, then the event IDs of the list and the event information
     list_id = list_event[0]['id_list']
+    list_ids = await ListEventDB.get_list_event_ids_by_id_list(id_list=list_id, type_list='private')
+    msg_and_buttons = await get_msg_info_events(list_ids_event=list_ids)
     msg = msg_and_buttons['msg']
 
     # Generate pagination keyboard with event details
@@ -59,11 +58,10 @@ async def find_list_by_key(message: Message, state: FSMContext):
                                      id_user=message.from_user.id)
 
     # Check if the event list is already in the user's favorites
-    info_user_favorite_private_lists = await UserDB.get_favorite_private_list_by_user_id(id_user=message.from_user.id)
-    list_favorite_users = info_user_favorite_private_lists[0]['favorites_private_lists']
+    is_favorite = await UserDB.is_favorite_private_list(tg_id=message.from_user.id, list_id=list_id)
 
     # Add a button to add or remove the list from the user's favorites
-    if str(list_id) in str(list_favorite_users).split(','):
+    if is_favorite:
         button_to_favorit = InlineKeyboardButton(text='Delete from my favorites',
                                                  callback_data=f'delete_list_in_my_favorit_{list_id}')
         keyboard.inline_keyboard.append([button_to_favorit])
@@ -2,12 +2,17 @@ from aiogram import Router, Bot, F
 from aiogram.types import Message, CallbackQuery, InlineKeyboardButton
 from aiogram.enums.parse_mode import ParseMode
 
-from TelegramBot.conference_mode.conference_routers.gaianet_sql import chat_with_sql
+from TelegramBot.conference_mode.utils.search_cache import search_cache
+from TelegramBot.conference_mode.utils.local_search import event_search
+from TelegramBot.utils.llm_scheduler import SchedulerBusy
+from TelegramBot.utils.gaianet_client import gaianet_breaker
+from TelegramBot.utils.admin_alerts import admin_alerts
 from TelegramBot.utils.log_message import log_message
 from TelegramBot.utils.check_subscription import check_subscription
 from TelegramBot.middleware.middlewares import UserModeFilter
 from TelegramBot.conference_mode.utils.pagination import PaginationEvent, paginator_event, get_msg_info_events, \
-    events_storage
+    count_pages, EVENTS_ON_PAGE
+from TelegramBot.conference_mode.utils.result_store import result_store
 
 # Initialize router for event search with the 'conference' mode filter
 router_search_events = Router()
@@ -20,14 +25,34 @@ router_search_events.message.filter(UserModeFilter(mode='conference'))
 async def message_handler(message: Message, bot: Bot):
     """
     Handles user messages that are not starting with 'PB'.
-    This function sends the user's query to OpenAI for SQL-based event search and returns paginated results.
+    The query is answered by the local search engine when it can, otherwise it is sent to Gaianet
+    for SQL-based event search. While Gaianet is busy or unavailable the best local matches are returned.
+    Returns paginated results.
 
     :param message: Message object from the user
     :param bot: Bot instance for sending messages
     """
     try:
-        await message.answer('Searching... 🕵️')  # Send a loading message
-        answer = await chat_with_sql(query=message.text)  # Query the events using OpenAI
+        answer = event_search.search(query=message.text)  # Local search, takes milliseconds
+        busy = False
+        if answer is None and gaianet_breaker.allows_calls():
+            await message.answer('Searching... 🕵️')  # Send a loading message
+            try:
+                # Query the events using Gaianet (cached)
+                answer = await search_cache.search(query=message.text, user_id=message.from_user.id)
+            except SchedulerBusy:
+                busy = True
+            except Exception as ex:
+                admin_alerts.report('Search failed', f'{message.text}: {ex}')
+
+        if answer is None:
+            # Gaianet is busy or unavailable, fall back to the best local matches
+            answer = event_search.search(query=message.text, relaxed=True)
+        if answer is None:
+            if busy:
+                return await message.answer(text='Too many searches right now 🤖 Please try again in a minute.')
+            return await message.answer(text='Error 🤖 Please specify your question or try asking in a different way.')
+
         msg_and_buttons = await get_msg_info_events(list_ids_event=answer)  # Fetch event details
         msg = msg_and_buttons['msg']  # Get the message to be displayed
         keyboard = await paginator_event(list_ids=answer, buttons=msg_and_buttons['buttons'],
@@ -37,10 +62,9 @@ async def message_handler(message: Message, bot: Bot):
         return await message.answer(text=msg, reply_markup=keyboard, disable_web_page_preview=True,
                                     parse_mode=ParseMode.MARKDOWN)
     except Exception as ex:
-        # Handle errors and notify both the user and admin
-        await message.answer(text='Error 🤖 Please specify your question or try asking in a different way.')
-        await bot.send_message(chat_id=854686840, text=f'query: {message.text}')
-        return await bot.send_message(chat_id=854686840, text=f'Error\n{ex}')
+        # Handle errors, the admins get them in the next alert digest
+        admin_alerts.report('Search failed', f'{message.text}: {ex}')
+        return await message.answer(text='Error 🤖 Please specify your question or try asking in a different way.')
 
 
 @log_message()  # Log callback queries for pagination
@@ -58,24 +82,28 @@ async def pagination_for_all_list(call: CallbackQuery, callback_data: Pagination
 
     if callback_data.action == 'next_events':
         # Calculate the next page, ensuring it does not exceed the maximum number of pages
-        page = page_num + 1 if page_num < int(callback_data.count_event / 5) else page_num
+        page = page_num + 1 if page_num < count_pages(callback_data.count_event) - 1 else page_num
 
     key = callback_data.key
-    events_list = events_storage.get(key, [])  # Retrieve the list of events from storage
+    session = await result_store.get(token=key, id_user=call.from_user.id)  # Retrieve the list of events
+    if session is None:
+        return await call.answer(text='This list has expired, please search again', show_alert=True)
+    events_list = session['ids']
 
     # Fetch event details for the current page
-    msg_and_buttons = await get_msg_info_events(list_ids_event=events_list, skip=page * 5, limit=page * 5 + 5)
+    msg_and_buttons = await get_msg_info_events(list_ids_event=events_list, skip=page * EVENTS_ON_PAGE,
+                                                limit=page * EVENTS_ON_PAGE + EVENTS_ON_PAGE)
     msg = msg_and_buttons['msg']  # Get the message content
 
     # Generate the appropriate keyboard depending on whether it's the user's list or not
     if callback_data.my_list:
         keyboard = await paginator_event(page=page, list_ids=events_list, buttons=msg_and_buttons['buttons'],
-                                         id_user=call.from_user.id, my_list=True)
+                                         id_user=call.from_user.id, my_list=True, token=key)
         new_button = InlineKeyboardButton(text='Share List', callback_data='share_my_private_list')
         keyboard.inline_keyboard.append([new_button])  # Add 'Share List' button if it's the user's list
     else:
         keyboard = await paginator_event(page=page, list_ids=events_list, buttons=msg_and_buttons['buttons'],
-                                         id_user=call.from_user.id)
+                                         id_user=call.from_user.id, token=key)
 
     # Update the message with the new events for the selected page
     await call.message.edit_text(text=msg, reply_markup=keyboard, parse_mode=ParseMode.MARKDOWN,
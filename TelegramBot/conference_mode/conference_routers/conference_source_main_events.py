@@ -5,10 +5,9 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State
 from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardButton
 
-from TelegramBot.conference_mode.utils.pagination import PaginationEvent, paginator_event, get_msg_info_events, \
-    events_storage
+from TelegramBot.conference_mode.utils.pagination import PaginationEvent, paginator_event, get_msg_info_events
 from TelegramBot.utils.coincidence import ContainsSubstringFilter
-from data.async_database import Event
+from data.event_catalog import event_catalog
 
 
 # State management class for finding main events
@@ -76,7 +75,7 @@ async def keyboard_find_main_events():
 
 # Initialize the router and event database instance
 router_source_main_events = Router()
-eventDB = Event()
+eventDB = event_catalog
 
 
 @router_source_main_events.message(F.text == '📜Main Event Agenda')
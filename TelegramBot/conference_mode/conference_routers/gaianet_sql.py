@@ -1,24 +1,17 @@
-import asyncio
-import openai
-import os
-import json
+from time import monotonic
+
 from data.async_database import AsyncDataBase
-from TelegramBot.settings.config import GAIANET_URL
-from langchain.utilities import SQLDatabase
-from langchain.llms import OpenAI
-from langchain_community.chat_models import ChatOpenAI
-from langchain_experimental.sql import SQLDatabaseChain
+from TelegramBot.settings.config import GAIANET_SQL_TIMEOUT
+from TelegramBot.utils.gaianet_client import gaianet_client
+from TelegramBot.utils.llm_scheduler import llm_scheduler
+from TelegramBot.conference_mode.utils.schema_context import schema_context
 
 role_chat = """
 Your custom role for gaianet chat
 """
 
-# Initialize OpenAI client with custom GAIANET_URL
-client = openai.OpenAI(base_url=GAIANET_URL)
-
-# Initialize database connection
-db = SQLDatabase.from_uri("URL_DATABASE")
-db_chain = SQLDatabaseChain.from_llm(client, db, verbose=True, top_k=10)
+# Size of the prompts and latency of the SQL generation, for the 'search cache' admin command
+sql_generation_stats = {'calls': 0, 'prompt_chars': 0, 'seconds': 0.0}
 
 
 async def chat_with_sql(query: str):
@@ -29,29 +22,59 @@ async def chat_with_sql(query: str):
     :param query: User's natural language query
     :return: List of event IDs retrieved from the database
     """
-    # Send the query to OpenAI's chat completion model
-    response = db_chain.create(
-        model="Phi-3-mini-4k-instruct-Q5_K_M",
-        timeout=300,
-        messages=[
-            {"role": "system", "content": role_chat},  # Define the assistant's role
-            {"role": "user", "content": query}  # User's query
-        ],
-        temperature=0.7,
-        max_tokens=600
-    )
-
-    # Parse the response from OpenAI
-    response_json = json.loads(response.json())
+    sql = await generate_sql(query=query)
+    return await execute_generated_sql(sql=sql, query=query)
 
-    # Initialize the AsyncDatabase instance to execute the generated SQL query
-    database = AsyncDataBase()
+
+async def generate_sql(query: str, user_id: int = None):
+    """
+    Sends a user's query to Gaianet and returns the SQL query it generated.
+
+    :param query: User's natural language query
+    :param user_id: Telegram ID of the user who asked
+    :return: SQL query
+    """
+    # Compact schema of the events table, rebuilt only when the catalog changes
+    system_prompt = f"{role_chat}\n{schema_context.get()}"
+
+    async def ask():
+        started = monotonic()
+        response = await gaianet_client.chat(
+            model="Phi-3-mini-4k-instruct-Q5_K_M",
+            timeout=GAIANET_SQL_TIMEOUT,
+            messages=[
+                {"role": "system", "content": system_prompt},  # Define the assistant's role and the schema
+                {"role": "user", "content": query}  # User's query
+            ],
+            temperature=0.7,
+            max_tokens=600
+        )
+        sql_generation_stats['calls'] += 1
+        sql_generation_stats['prompt_chars'] += len(system_prompt) + len(query)
+        sql_generation_stats['seconds'] += monotonic() - started
+        return response
+
+    # Send the query to Gaianet's chat completion model (through the shared LLM queue)
+    answer = await llm_scheduler.submit(func=ask, user_id=user_id)
 
     # Clean up the SQL query from the response
-    answer = response_json['choices'][0]['message']['content'].replace('sql', '').replace('```', '')
+    return answer.replace('sql', '').replace('```', '')
+
+
+async def execute_generated_sql(sql: str, query: str = None):
+    """
+    Executes an SQL query generated by Gaianet and returns the IDs of the found events.
+    Only bounded SELECTs on the events table are executed (see guard_generated_sql).
+
+    :param sql: SQL query
+    :param query: User's natural language query the SQL was generated for
+    :return: List of event IDs retrieved from the database
+    """
+    # Initialize the AsyncDatabase instance to execute the generated SQL query
+    database = AsyncDataBase()
 
     # Execute the query in the database
-    result = await database.execute_query_for_gpt(query=answer)
+    result = await database.execute_query_for_gpt(query=sql, user_query=query)
 
     # Extract event IDs from the query results
     result_id = [event['id_event'] for event in result]
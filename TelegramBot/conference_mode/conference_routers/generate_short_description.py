@@ -1,21 +1,20 @@
-from openai import OpenAI
-from TelegramBot.settings.config import GAIANET_URL
+from TelegramBot.utils.gaianet_client import gaianet_client
+from TelegramBot.utils.llm_scheduler import llm_scheduler, INTERACTIVE
 
-client = OpenAI(base_url=GAIANET_URL)
-
-async def generate_short_description(full_description: str):
+async def generate_short_description(full_description: str, user_id: int = None, priority: int = INTERACTIVE):
     """
     Function that generates a short summary (250-300 characters) of the event description,
     keeping key details like speakers, sponsors, and organizers.
 
     :param full_description: Full text of the event description
+    :param user_id: Telegram ID of the user waiting for the summary (None for background jobs)
+    :param priority: Priority of the request in the LLM queue
     :return: Summary of the event, excluding name, date, time, location, and link
     """
-    response = client.chat.completions.create(
+    return await llm_scheduler.submit(func=lambda: gaianet_client.chat(
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": "You are a helpful assistant."},
             {"role": "user", "content": f"I need a summary of the event information. The final message should be 250-300 characters long, keeping the key details: speakers, sponsors, organizers. Do not include the event name, date, time, location, link. Focus on providing only the main details and purpose of the event in a concise format. Here is the text to process: {full_description}"}
         ]
-    )
-    return response.choices[0].message.content
+    ), user_id=user_id, priority=priority)
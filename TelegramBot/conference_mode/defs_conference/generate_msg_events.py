@@ -1,8 +1,16 @@
+import re
+
 from TelegramBot.conference_mode.keyboards.builders import keyboard_for_view_extended_info_events
-from data.async_database import Event
-from TelegramBot.conference_mode.conference_routers.generate_short_description import generate_short_description
+from data.event_catalog import event_catalog
+from TelegramBot.conference_mode.utils.summary_cache import summary_cache
+from TelegramBot.utils.llm_scheduler import SchedulerBusy
+from TelegramBot.utils.admin_alerts import admin_alerts
+from TelegramBot.utils.circuit_breaker import CircuitOpen
+
+# Length of the description shown instead of the summary when the AI is unavailable
+FALLBACK_DESCRIPTION_LENGTH = 300
 
-EventDB = Event()
+EventDB = event_catalog
 
 
 async def generate_info_many_events(list_ids_events: str | list, skip: int = 0, page: int = 1):
@@ -51,7 +59,7 @@ async def generate_info_many_events(list_ids_events: str | list, skip: int = 0,
 
         keyboard = await keyboard_for_view_extended_info_events(
             list_events=dict_for_keyboard_view_extended_info,
-            str_list_ids_event=','.join(list_ids_events)
+            str_list_ids_event=','.join(map(str, list_ids_events))
         )
 
         return {'msg': msg, 'keyboard': keyboard}
@@ -82,23 +90,45 @@ async def generate_info_many_events(list_ids_events: str | list, skip: int = 0,
 
         keyboard = await keyboard_for_view_extended_info_events(
             list_events=dict_for_keyboard_view_extended_info,
-            str_list_ids_event=','.join(list_ids_events)
+            str_list_ids_event=','.join(map(str, list_ids_events))
         )
 
 
-async def generate_extended_info_event(id_event: int):
+def fallback_description(description: str) -> str:
+    """
+    Returns the beginning of the raw description, without Markdown characters, for when no AI summary is available.
+
+    :param description: Full text of the event description
+    :return: Shortened description
+    """
+    text = re.sub(r'[_*`\[\]]', '', ' '.join(description.split()))
+    if len(text) > FALLBACK_DESCRIPTION_LENGTH:
+        text = text[:FALLBACK_DESCRIPTION_LENGTH].rsplit(' ', 1)[0] + '…'
+    return text
+
+
+async def generate_extended_info_event(id_event: int, user_id: int = None):
     """
     Generates detailed information for a specific event including an AI-generated summary.
 
     :param id_event: Event ID
+    :param user_id: Telegram ID of the user viewing the event
     :return: Formatted message with event details and AI-generated summary
     """
     event_info = await EventDB.get_info_event_by_id(id_event=id_event)
 
     speakers = event_info['speakers_event']
-    short_description = await generate_short_description(
-        full_description=event_info['description_event']
-    ) if event_info['description_event'] else 'The event has no description'
+    try:
+        short_description = await summary_cache.get_summary(
+            id_event=id_event,
+            description=event_info['description_event'],
+            user_id=user_id
+        ) if event_info['description_event'] else 'The event has no description'
+    except (SchedulerBusy, CircuitOpen):
+        short_description = fallback_description(event_info['description_event'])
+    except Exception as ex:
+        admin_alerts.report('Summary failed', f'event {id_event}: {ex}')
+        short_description = fallback_description(event_info['description_event'])
 
     msg = f"""*{event_info['name_event']}*
 🕒*Date event*: {event_info['date_event']}
@@ -50,11 +50,12 @@ async def keyboard_for_add_or_remove_event(id_event: int, tg_id: int):
     """
     builder = InlineKeyboardBuilder()
     lists_user = await ListEventsDb.get_lists_user_by_tg_id(tg_id=tg_id)
+    id_list = lists_user[0]['id_list']
     text = 'Event Removed ☑️'
-    callback = f"add_event_in_list_{id_event}*{lists_user[0]['id_list']}_Priv"
-    if str(id_event) in lists_user[0]['event_ids'].split(','):
+    callback = f"add_event_in_list_{id_event}*{id_list}_Priv"
+    if await ListEventsDb.is_event_in_list(id_event=id_event, id_list=id_list):
         text = 'Event saved ✅'
-        callback = f"remove_event_in_list_{id_event}*{lists_user[0]['id_list']}_Priv"
+        callback = f"remove_event_in_list_{id_event}*{id_list}_Priv"
     builder.add(InlineKeyboardButton(text=text, callback_data=callback))
     builder.add(InlineKeyboardButton(text='Back to list', callback_data='back_to_list_events'))
     builder.adjust(1)
@@ -71,11 +72,12 @@ async def keyboard_choice_for_add_in_list(id_event: int, tg_id: int):
     """
     builder = InlineKeyboardBuilder()
     lists_user = await ListEventsDb.get_lists_user_by_tg_id(tg_id=tg_id)
+    id_list = lists_user[0]['id_list']
     text = 'Save to Private list'
-    callback = f"add_event_in_list_{id_event}*{lists_user[0]['id_list']}_Priv"
-    if str(id_event) in lists_user[0]['event_ids'].split(','):
+    callback = f"add_event_in_list_{id_event}*{id_list}_Priv"
+    if await ListEventsDb.is_event_in_list(id_event=id_event, id_list=id_list):
         text = 'Remove from Private list'
-        callback = f"remove_event_in_list_{id_event}*{lists_user[0]['id_list']}_Priv"
+        callback = f"remove_event_in_list_{id_event}*{id_list}_Priv"
     builder.add(InlineKeyboardButton(text=text, callback_data=callback))
     builder.add(InlineKeyboardButton(text='Back to list', callback_data='back_to_list_events'))
     builder.adjust(1)
@@ -0,0 +1,135 @@
+import asyncio
+import hashlib
+from typing import Callable, Dict, List
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter, TelegramForbiddenError, TelegramBadRequest
+
+from data.async_database import BroadcastDB, UserDB
+from TelegramBot.settings.config import BROADCAST_RATE, BROADCAST_CONCURRENCY, BROADCAST_MAX_RETRIES
+from TelegramBot.utils.rate_limiter import TokenBucket
+
+# Shared by every broadcast so that parallel broadcasts stay within Telegram's global limit
+broadcast_bucket = TokenBucket(rate=BROADCAST_RATE)
+
+# Seconds between writes of the delivered recipients
+PROGRESS_FLUSH_INTERVAL = 2
+
+
+def broadcast_key(prefix: str, ids) -> str:
+    """
+    Builds a broadcast key from a set of IDs, so the same notification gets the same key after a restart.
+
+    :param prefix: Kind of the broadcast
+    :param ids: IDs the notification is about
+    :return: Broadcast key
+    """
+    digest = hashlib.md5(','.join(map(str, sorted(ids))).encode()).hexdigest()
+    return f'{prefix}:{digest}'
+
+
+class Broadcaster:
+    """
+    Sends a message to many users within Telegram's rate limits.
+
+    Messages go through a global token bucket and at most `concurrency` sends are in flight.
+    On RetryAfter the whole bucket is paused for the requested time and the message is retried,
+    users who blocked the bot are marked as blocked and skipped by later broadcasts, and the list of
+    delivered recipients is persisted so that a restarted broadcast with the same key resumes
+    instead of sending again.
+
+    :param bot: Bot instance used to send messages
+    """
+
+    def __init__(self, bot: Bot, concurrency: int = BROADCAST_CONCURRENCY, max_retries: int = BROADCAST_MAX_RETRIES):
+        self.bot = bot
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.database = BroadcastDB()
+        self.user_db = UserDB()
+
+    async def broadcast(self, key: str, recipients: List[int], build_message: Callable[[int], Dict]) -> Dict:
+        """
+        Sends a message to every recipient that has not received this broadcast yet.
+
+        :param key: Unique key of the broadcast, used to resume it after a restart
+        :param recipients: Telegram IDs of the recipients
+        :param build_message: Function returning the keyword arguments of send_message for a recipient
+        :return: Dictionary with the number of sent, blocked and failed messages
+        """
+        id_broadcast, finished = await self.database.start_broadcast(key=key)
+        stats = {'sent': 0, 'blocked': 0, 'failed': 0, 'skipped': 0}
+        if finished:
+            stats['skipped'] = len(recipients)
+            return stats
+
+        delivered = await self.database.get_delivered(id_broadcast=id_broadcast)
+        queue: asyncio.Queue = asyncio.Queue()
+        for tg_id in recipients:
+            if int(tg_id) in delivered:
+                stats['skipped'] += 1
+            else:
+                queue.put_nowait(int(tg_id))
+
+        progress = []  # (tg_id, status) rows not yet persisted
+        blocked = []
+
+        async def worker():
+            while not queue.empty():
+                tg_id = queue.get_nowait()
+                status = await self._send(tg_id=tg_id, message=build_message(tg_id))
+                stats[status] += 1
+                progress.append((id_broadcast, tg_id, status))
+                if status == 'blocked':
+                    blocked.append(tg_id)
+
+        async def flush_progress():
+            rows, progress[:] = progress[:], []
+            if not rows:
+                return
+            try:
+                await self.database.save_deliveries(rows=rows)
+            except BaseException:
+                progress[:0] = rows  # Written by the next flush
+                raise
+
+        async def flush_periodically():
+            while True:
+                await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+                try:
+                    await flush_progress()
+                except Exception as ex:
+                    print(f'Broadcast {key}: failed to save the progress: {ex}')
+
+        flusher = asyncio.create_task(flush_periodically())
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, queue.qsize()))))
+        finally:
+            flusher.cancel()
+            await asyncio.gather(flusher, return_exceptions=True)
+            await flush_progress()
+            if blocked:
+                await self.user_db.block_users(tg_ids=blocked)
+
+        await self.database.finish_broadcast(id_broadcast=id_broadcast)
+        print(f'Broadcast {key}: {stats}')
+        return stats
+
+    async def _send(self, tg_id: int, message: Dict) -> str:
+        for _ in range(self.max_retries + 1):
+            await broadcast_bucket.acquire()
+            try:
+                await self.bot.send_message(chat_id=tg_id, **message)
+                return 'sent'
+            except TelegramRetryAfter as ex:
+                broadcast_bucket.pause(ex.retry_after)
+            except TelegramForbiddenError:
+                return 'blocked'
+            except TelegramBadRequest as ex:
+                # E.g. chat not found: retrying will not help
+                print(f'Broadcast to {tg_id} failed: {ex}')
+                return 'failed'
+            except Exception as ex:
+                print(f'Broadcast to {tg_id} failed: {ex}')
+                await asyncio.sleep(1)
+        return 'failed'
@@ -6,6 +6,7 @@ from aiogram.enums.parse_mode import ParseMode
 from TelegramBot.conference_mode.utils.pagination import paginator_event, get_msg_info_events
 from data.async_database import ParsingDB, UserDB, ListEvents
 from TelegramBot.conference_mode.notification import keyboards
+from TelegramBot.conference_mode.notification.broadcast import Broadcaster, broadcast_key
 
 
 database = ParsingDB()
@@ -26,19 +27,17 @@ async def send_notication(bot: Bot):
 
     if new_events:
         keyboard = await keyboards.keyboard_for_view_all_new_events()
-        ids_for_send = await user.get_all_users()
-        ids_for_send = [user['tg_id'] for user in ids_for_send]
+        ids_for_send = await user.get_active_tg_ids()
 
         msg = f"""New KBW events detected 👀
 
 New events: {len(new_events)}
 Events in database: {count_events}"""
 
-        for id_user in ids_for_send:
-            try:
-                await bot.send_message(chat_id=id_user, text=msg, reply_markup=keyboard)
-            except Exception as ex:
-                print(f"{ex}")
+        # The same set of new events is never announced twice, even after a restart
+        key = broadcast_key('new_events', [event['id_event'] for event in new_events])
+        await Broadcaster(bot=bot).broadcast(key=key, recipients=ids_for_send,
+                                             build_message=lambda tg_id: {'text': msg, 'reply_markup': keyboard})
     else:
         return
 
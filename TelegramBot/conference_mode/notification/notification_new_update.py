@@ -3,41 +3,29 @@ from aiogram import Router, Bot, F
 from aiogram.types.callback_query import CallbackQuery
 from aiogram.enums.parse_mode import ParseMode
 
-from TelegramBot.conference_mode.utils.pagination import PaginationEvent, paginator_event, get_msg_info_events, \
-    events_storage
+from TelegramBot.conference_mode.utils.pagination import PaginationEvent, paginator_event, get_msg_info_events
 from data.async_database import ParsingDB, UserDB, ListEvents
 from TelegramBot.conference_mode.notification.keyboard_event_update import keyboard_for_updated_events
+from TelegramBot.conference_mode.notification.broadcast import Broadcaster, broadcast_key
 
 database = ParsingDB()
 ListEventDB = ListEvents()
 router = Router()
 
-# Temporary storage for updated events to send to users
-temp_dict_for_keyboard_updated_events = {}
-
 
 async def get_dict_for_send_update_events():
     """
     Retrieves a dictionary of users and the updated events they have in their private lists.
+    Costs one query for the updated events and one query for the users whose lists contain them.
 
-    :return: Dictionary where key is the user ID and value is a list of updated event IDs
+    :return: Dictionary where key is the user's Telegram ID and value is a list of updated event IDs
     """
     updated_events = await database.get_last_update_event(hours=5)
-    users = await ListEventDB.get_all_private_lists()
 
     # Extract event IDs from updated events
     updated_events = [event['id_event'] for event in updated_events]
 
-    notifications = {}
-
-    for user in users:
-        events = [int(id_event) for id_event in user['event_ids'].split(',')]
-        matching_events = list(set(events) & set(updated_events))
-
-        if matching_events:
-            notifications[user['id_user']] = matching_events
-
-    return notifications
+    return await ListEventDB.get_subscribers_by_events(list_ids_events=updated_events)
 
 
 async def send_notication(bot: Bot):
@@ -46,31 +34,35 @@ async def send_notication(bot: Bot):
 
     :param bot: Instance of the bot used to send notifications
     """
-    user = UserDB()
     dict_notification = await get_dict_for_send_update_events()
 
     if dict_notification:
-        for user_dict in dict_notification:
-            id_for_send = await user.get_info_by_id(id_user=int(user_dict))
-            tg_id_for_send = id_for_send[0]['tg_id']
-            id_for_send = id_for_send[0]['id_user']
+        keyboard = await keyboard_for_updated_events()
 
-            id_events_for_send = dict_notification[str(id_for_send)]
-            temp_dict_for_keyboard_updated_events[int(tg_id_for_send)] = id_events_for_send
-            keyboard = await keyboard_for_updated_events()
+        def build_message(tg_id: int):
+            msg = f"""{len(dict_notification[tg_id])} events from your list updated"""
+            return {'text': msg, 'reply_markup': keyboard}
 
-            msg = f"""{len(id_events_for_send)} events from your list updated"""
-            await bot.send_message(chat_id=tg_id_for_send, text=msg, reply_markup=keyboard)
+        # The key changes with the set of updates, so the same updates are not announced twice after a restart
+        key = broadcast_key('updated_events', [f'{tg_id}:{id_event}' for tg_id, events in dict_notification.items()
+                                               for id_event in events])
+        await Broadcaster(bot=bot).broadcast(key=key, recipients=list(dict_notification), build_message=build_message)
 
 
 @router.callback_query(F.data == 'view_about_updated_events')
 async def view_about_new_events(callback_query: CallbackQuery):
     """
     Displays updated events when the user clicks on the 'Show updated events' button.
+    The events are looked up again in the database, so the click can reach any bot process.
 
     :param callback_query: Callback query from the user
     """
-    id_events_for_send = temp_dict_for_keyboard_updated_events[callback_query.from_user.id]
+    updated_events = {event['id_event'] for event in await database.get_last_update_event(hours=24)}
+    id_events_for_send = [id_event for id_event in
+                          await ListEventDB.get_private_list_event_ids_by_tg_id(tg_id_user=callback_query.from_user.id)
+                          if id_event in updated_events]
+    if not id_events_for_send:
+        return await callback_query.message.edit_text(text='No updated events')
 
     msg_and_buttons = await get_msg_info_events(list_ids_event=id_events_for_send)
     keyboard = await paginator_event(list_ids=id_events_for_send, buttons=msg_and_buttons['buttons'],
@@ -0,0 +1,166 @@
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from data.event_catalog import event_catalog
+from TelegramBot.settings.config import LOCAL_SEARCH_MIN_COVERAGE, LOCAL_SEARCH_CUTOFF, LOCAL_SEARCH_MAX_RESULTS
+
+# Words that do not change the meaning of a search query
+STOP_WORDS = frozenset((
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'at', 'for', 'with', 'about', 'is', 'are', 'be',
+    'me', 'my', 'i', 'you', 'please', 'show', 'find', 'give', 'list', 'search', 'any', 'some', 'all',
+    'what', 'which', 'there', 'can', 'could', 'would', 'want', 'need', 'looking', 'like', 'event', 'events'
+))
+
+# Words that need an understanding of dates or logic, such queries are left to the LLM
+LLM_WORDS = frozenset((
+    'today', 'tonight', 'tomorrow', 'yesterday', 'morning', 'afternoon', 'evening', 'night', 'weekend', 'now',
+    'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday', 'before', 'after', 'between',
+    'until', 'since', 'next', 'last', 'not', 'without', 'except', 'no', 'first', 'latest', 'earliest'
+))
+
+# Searchable columns and their weights
+SEARCH_FIELDS = {
+    'name_event': 3.0,
+    'tags_event': 2.0,
+    'speakers_event': 1.5,
+    'host_event': 1.5,
+    'location_event': 1.5,
+    'description_event': 1.0,
+}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Splits a text into lower-case words without stop words.
+    """
+    return [word for word in re.findall(r'\w+', (text or '').lower()) if word not in STOP_WORDS]
+
+
+class EventSearchEngine:
+    """
+    In-process BM25 search over the event catalog.
+
+    Every event is indexed by the words of its searchable columns, weighted by column. The term frequencies
+    of an event are kept until the event changes, so when the catalog version changes only changed events
+    are tokenized again and the NumPy posting arrays are rebuilt from the cached counts.
+
+    `search` returns None when it cannot answer confidently: the query refers to dates or logic
+    (see LLM_WORDS), too few of its words are known, or nothing matches. Such queries go to the LLM.
+    With `relaxed=True` (used while the LLM is unavailable) it returns the best matches of the known words.
+
+    :param min_coverage: Share of the query words that must occur in the catalog
+    :param cutoff: Results must score at least this share of the best score
+    :param max_results: Maximum number of results
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, min_coverage: float = LOCAL_SEARCH_MIN_COVERAGE, cutoff: float = LOCAL_SEARCH_CUTOFF,
+                 max_results: int = LOCAL_SEARCH_MAX_RESULTS):
+        self.min_coverage = min_coverage
+        self.cutoff = cutoff
+        self.max_results = max_results
+        self.version = None
+        self._docs: Dict[int, tuple] = {}  # id_event -> (column values, weighted term counts, weighted length)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._norm = np.zeros(0, dtype=np.float32)
+        self._postings: Dict[str, tuple] = {}  # term -> (document indexes, weighted term frequencies)
+        self._idf: Dict[str, float] = {}
+        self.answered = 0
+        self.passed_to_llm = 0
+
+    def refresh(self) -> None:
+        """
+        Rebuilds the index if the catalog has changed since the last build.
+        """
+        if not event_catalog.loaded or event_catalog.version == self.version:
+            return
+        version = event_catalog.version
+
+        docs = {}
+        for id_event, event in event_catalog.events.items():
+            values = tuple(event.get(column) for column in SEARCH_FIELDS)
+            doc = self._docs.get(id_event)
+            docs[id_event] = doc if doc is not None and doc[0] == values else self._index_event(values)
+
+        self._docs = docs
+        self._build()
+        self.version = version
+
+    @staticmethod
+    def _index_event(values: tuple) -> tuple:
+        counts = Counter()
+        for value, weight in zip(values, SEARCH_FIELDS.values()):
+            for word in tokenize(value):
+                counts[word] += weight
+        return values, counts, sum(counts.values())
+
+    def _build(self) -> None:
+        ids = sorted(self._docs)
+        term_docs = defaultdict(list)
+        term_freqs = defaultdict(list)
+        for index, id_event in enumerate(ids):
+            for term, freq in self._docs[id_event][1].items():
+                term_docs[term].append(index)
+                term_freqs[term].append(freq)
+
+        lengths = np.array([self._docs[id_event][2] for id_event in ids], dtype=np.float32)
+        average_length = float(lengths.mean()) if len(ids) and lengths.mean() > 0 else 1.0
+        count = len(ids)
+
+        self._ids = np.array(ids, dtype=np.int64)
+        self._norm = self.k1 * (1 - self.b + self.b * lengths / average_length)
+        self._postings = {term: (np.array(term_docs[term], dtype=np.int32), np.array(term_freqs[term], dtype=np.float32))
+                          for term in term_docs}
+        self._idf = {term: math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5)) for term, docs in term_docs.items()}
+
+    def search(self, query: str, relaxed: bool = False) -> Optional[List[int]]:
+        """
+        Finds the events matching a free-text query.
+
+        :param query: User's natural language query
+        :param relaxed: Answer even if the query is not understood completely
+        :return: Event IDs ordered by relevance, or None if the query should go to the LLM
+        """
+        self.refresh()
+        result = self._search(query, relaxed=relaxed) if self.version is not None else None
+        if result is None:
+            self.passed_to_llm += 1
+        else:
+            self.answered += 1
+        return result
+
+    def _search(self, query: str, relaxed: bool = False) -> Optional[List[int]]:
+        if not relaxed and LLM_WORDS.intersection(re.findall(r'\w+', query.lower())):
+            return None
+        terms = set(tokenize(query))
+        known = [term for term in terms if term in self._postings]
+        if not known or (not relaxed and len(known) < len(terms) * self.min_coverage):
+            return None
+
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        for term in known:
+            indexes, freqs = self._postings[term]
+            scores[indexes] += self._idf[term] * freqs * (self.k1 + 1) / (freqs + self._norm[indexes])
+
+        best = float(scores.max()) if len(scores) else 0.0
+        if best <= 0:
+            return None
+        selected = np.nonzero(scores >= best * self.cutoff)[0]
+        ranked = selected[np.argsort(-scores[selected], kind='stable')][:self.max_results]
+        return [int(id_event) for id_event in self._ids[ranked]]
+
+    def stats(self) -> Dict:
+        """
+        Returns the number of queries answered locally and passed to the LLM.
+        """
+        return {'answered': self.answered, 'passed_to_llm': self.passed_to_llm, 'events': len(self._ids)}
+
+
+# Shared search engine used by the free-text search
+event_search = EventSearchEngine()
@@ -1,16 +1,17 @@
 from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardButton
 from aiogram.filters.callback_data import CallbackData
 
-from data.async_database import Event
+from data.event_catalog import event_catalog
 from TelegramBot.conference_mode.defs_conference import generate_msg_events
+from TelegramBot.conference_mode.utils.result_store import result_store
 
-events_storage = {}
-events_storage_now_page = {}
+EVENTS_ON_PAGE = 5
 
 
 class PaginationEvent(CallbackData, prefix="pag_event"):
     """
     Callback data class for handling pagination events.
+    `key` is the session token of the result set in the result store.
     """
     action: str
     page: int
@@ -20,28 +21,67 @@ class PaginationEvent(CallbackData, prefix="pag_event"):
     my_list: int = 0
 
 
-async def paginator_event(list_ids: str | list, buttons: list, id_user: int, page: int = 0, my_list: bool = False):
+def prepare_event_ids(list_ids: str | list) -> list:
+    """
+    Turns a result set into the ordered list of event IDs used for pagination.
+    Empty items of comma-separated lists and duplicates are removed, and events that are no longer
+    in the catalog are dropped, so the length of the list is the number of events.
+    The order of the result set (relevance or the ORDER BY of the query) is kept.
+
+    :param list_ids: List or comma-separated string of event IDs
+    :return: Ordered list of event IDs
+    """
+    if isinstance(list_ids, str):
+        list_ids = list_ids.split(',')
+    return event_catalog.filter_existing_ids(list_ids)
+
+
+def count_pages(count_event: int) -> int:
+    """
+    Returns the number of pages for the given number of events.
+    """
+    return max((count_event + EVENTS_ON_PAGE - 1) // EVENTS_ON_PAGE, 1)
+
+
+async def get_page_events(list_ids: list, skip: int, limit: int) -> list:
+    """
+    Fetches only the events of the requested page (served from the event catalog).
+
+    :param list_ids: Ordered list of event IDs (see prepare_event_ids)
+    :param skip: Index of the first event on the page
+    :param limit: Index after the last event on the page
+    :return: Events of the page in the order of list_ids
+    """
+    page_ids = tuple(list_ids[skip:limit])
+    if not page_ids:
+        return []
+
+    events = await event_catalog.get_info_many_events(list_ids_events=page_ids)
+    events_by_id = {event['id_event']: event for event in events}
+    return [events_by_id[id_event] for id_event in page_ids if id_event in events_by_id]
+
+
+async def paginator_event(list_ids: str | list, buttons: list, id_user: int, page: int = 0, my_list: bool = False,
+                          token: str | None = None):
     """
     Creates a pagination inline keyboard for event navigation.
+    A new result set is stored unless the token of an existing one is given.
 
     :param list_ids: List or comma-separated string of event IDs
     :param buttons: List of InlineKeyboardButton objects
     :param id_user: Telegram user ID
     :param page: Current page number
     :param my_list: Boolean flag indicating if it's the user's private list
+    :param token: Session token of the result set being paged through
     :return: InlineKeyboardMarkup for paginated events
     """
-    if isinstance(list_ids, str):
-        list_ids_1 = list_ids.split(',')
+    list_ids_1 = prepare_event_ids(list_ids)
+    count_event = len(list_ids_1)
+    if token is None:
+        key = await result_store.create(id_user=id_user, list_ids=list_ids_1, page=page)
     else:
-        list_ids_1 = list_ids
-
-    event = Event()
-    events = await event.get_info_many_events(list_ids_events=list_ids_1)
-    count_event = len(events)
-    key = str(id_user)
-    events_storage[key] = list_ids_1
-    events_storage_now_page[key] = page
+        key = token
+        await result_store.set_page(token=token, id_user=id_user, page=page)
 
     builder = InlineKeyboardBuilder()
     [builder.add(button) for button in buttons]
@@ -53,35 +93,32 @@ async def paginator_event(list_ids: str | list, buttons: list, id_user: int, pag
 
     builder.row(
         InlineKeyboardButton(text='⬅', callback_data=prev_callback_data),
-        InlineKeyboardButton(text=f"{page + 1}/{(count_event + 4) // 5}", callback_data='None'),
+        InlineKeyboardButton(text=f"{page + 1}/{count_pages(count_event)}", callback_data='None'),
         InlineKeyboardButton(text='➡', callback_data=next_callback_data),
         width=3
     )
     return builder.as_markup()
 
 
-async def get_msg_info_events(list_ids_event: str | list, skip: int = 0, limit: int = 5):
+async def get_msg_info_events(list_ids_event: str | list, skip: int = 0, limit: int = EVENTS_ON_PAGE):
     """
     Generates a message and buttons for displaying event information.
+    Only the events of the requested page are fetched.
 
     :param list_ids_event: List or comma-separated string of event IDs
     :param skip: Number of events to skip for pagination
-    :param limit: Maximum number of events to display
+    :param limit: Index after the last event to display
     :return: Dictionary containing the message and associated buttons
     """
-    if isinstance(list_ids_event, str):
-        list_ids_event = list_ids_event.split(',')
-
-    event = Event()
-    list_events = await event.get_info_many_events(list_ids_events=list_ids_event)
+    list_ids_event = prepare_event_ids(list_ids_event)
+    list_events = await get_page_events(list_ids=list_ids_event, skip=skip, limit=limit)
 
-    msg = f'Events found: {len(list_events)}\n'
-    list_events = list_events[skip:limit]
+    msg = f'Events found: {len(list_ids_event)}\n'
     buttons = []
     pagination_event = 1
     pagination_event_emoji = ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣']
 
-    if len(list_ids_event) == 1:
+    if len(list_ids_event) == 1 and list_events:
         id_event = list_events[0]['id_event']
         msg = await generate_msg_events.generate_extended_info_event(id_event=id_event)
         buttons.append(
@@ -0,0 +1,239 @@
+import asyncio
+import json
+import secrets
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+from typing import Dict, Optional
+
+from TelegramBot.settings.config import RESULT_STORE_BACKEND, RESULT_STORE_PATH, RESULT_STORE_TTL, \
+    RESULT_STORE_MAX_SESSIONS, RESULT_STORE_MAX_IDS
+from data.async_database import ResultSetDB
+
+CLEANUP_INTERVAL = 600  # Seconds between evictions of the 'sqlite' and 'mysql' backends
+
+
+class MemoryResultStoreBackend:
+    """
+    In-process key-value backend with TTL, LRU eviction and a cap on the total number of stored event IDs.
+    """
+
+    def __init__(self, ttl: int, max_sessions: int, max_ids: int):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_ids = max_ids
+        self._data: OrderedDict = OrderedDict()
+        self._ids_count = 0
+
+    async def get(self, key: str) -> Optional[Dict]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time():
+            await self.delete(key)
+            return None
+        self._data[key] = (time() + self.ttl, value)
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Dict) -> None:
+        await self.delete(key)
+        self._data[key] = (time() + self.ttl, value)
+        self._ids_count += len(value.get('ids', ()))
+        while self._data and (len(self._data) > self.max_sessions or self._ids_count > self.max_ids):
+            await self.delete(next(iter(self._data)))
+
+    async def delete(self, key: str) -> None:
+        item = self._data.pop(key, None)
+        if item is not None:
+            self._ids_count -= len(item[1].get('ids', ()))
+
+
+class SqliteResultStoreBackend:
+    """
+    Key-value backend in a local SQLite file, so several bot processes on one host can share result sets
+    and they survive a restart. The queries run in a dedicated thread, so they do not block the event loop.
+    Expired and least recently used entries are evicted by start_clean_result_sets.
+    """
+
+    def __init__(self, path: str, ttl: int, max_sessions: int):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='result-store')
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS result_sets (
+                                 key TEXT PRIMARY KEY,
+                                 value TEXT,
+                                 expires_at REAL
+                             )""")
+        self.conn.execute('CREATE INDEX IF NOT EXISTS result_sets_expires ON result_sets (expires_at)')
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _get(self, key: str) -> Optional[str]:
+        row = self.conn.execute('SELECT value FROM result_sets WHERE key = ? AND expires_at >= ?',
+                                (key, time())).fetchone()
+        if row is None:
+            return None
+        self.conn.execute('UPDATE result_sets SET expires_at = ? WHERE key = ?', (time() + self.ttl, key))
+        return row[0]
+
+    def _set(self, key: str, value: str) -> None:
+        self.conn.execute('INSERT OR REPLACE INTO result_sets (key, value, expires_at) VALUES (?, ?, ?)',
+                          (key, value, time() + self.ttl))
+
+    def _delete(self, key: str) -> None:
+        self.conn.execute('DELETE FROM result_sets WHERE key = ?', (key,))
+
+    def _delete_expired(self) -> None:
+        self.conn.execute('DELETE FROM result_sets WHERE expires_at < ?', (time(),))
+        # expires_at grows with the last access, so the smallest values are the least recently used
+        self.conn.execute("""DELETE FROM result_sets WHERE key IN (
+                                 SELECT key FROM result_sets ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+                             )""", (self.max_sessions,))
+
+    async def get(self, key: str) -> Optional[Dict]:
+        value = await self._run(self._get, key)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Dict) -> None:
+        await self._run(self._set, key, json.dumps(value))
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._delete, key)
+
+    async def delete_expired(self) -> None:
+        await self._run(self._delete_expired)
+
+
+class MySQLResultStoreBackend:
+    """
+    Key-value backend in the 'result_sets' table, so every bot process and host sees the same result sets.
+    Entries live `ttl` seconds after the last access; expired ones are deleted by start_clean_result_sets.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.db = ResultSetDB()
+
+    async def get(self, key: str) -> Optional[Dict]:
+        value = await self.db.get_result_set(set_key=key, ttl=self.ttl)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Dict) -> None:
+        await self.db.save_result_set(set_key=key, value=json.dumps(value), ttl=self.ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.db.delete_result_set(set_key=key)
+
+    async def delete_expired(self) -> None:
+        await self.db.delete_expired_result_sets()
+
+
+class ResultSetStore:
+    """
+    Stores the event lists (result sets) users page through.
+
+    Every list gets its own session token, which is embedded in the PaginationEvent callback data,
+    so opening a new list does not break the pagination of an older message. The last token of every
+    user is kept as well, for buttons like 'Back to list' that carry no token.
+
+    :param backend: Key-value backend (MemoryResultStoreBackend, SqliteResultStoreBackend or MySQLResultStoreBackend)
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def create(self, id_user: int, list_ids: list, page: int = 0) -> str:
+        """
+        Stores a new result set and makes it the user's current one.
+
+        :param id_user: Telegram user ID
+        :param list_ids: Ordered list of event IDs
+        :param page: Current page
+        :return: Session token
+        """
+        token = secrets.token_hex(8)
+        await self.backend.set(f'set:{token}', {'user': id_user, 'ids': list(list_ids), 'page': page})
+        await self.backend.set(f'last:{id_user}', {'token': token})
+        return token
+
+    async def get(self, token: str, id_user: int) -> Optional[Dict]:
+        """
+        Returns the result set of the token if it exists and belongs to the user.
+
+        :param token: Session token
+        :param id_user: Telegram user ID
+        :return: Dictionary with 'ids' and 'page', or None
+        """
+        session = await self.backend.get(f'set:{token}')
+        if session is None or session['user'] != id_user:
+            return None
+        return session
+
+    async def set_page(self, token: str, id_user: int, page: int) -> None:
+        """
+        Remembers the page the user is on and makes the result set the user's current one.
+
+        :param token: Session token
+        :param id_user: Telegram user ID
+        :param page: Current page
+        """
+        session = await self.get(token=token, id_user=id_user)
+        if session is not None:
+            await self.backend.set(f'set:{token}', {**session, 'page': page})
+            await self.backend.set(f'last:{id_user}', {'token': token})
+
+    async def last_token(self, id_user: int) -> Optional[str]:
+        """
+        Returns the token of the result set the user opened last.
+
+        :param id_user: Telegram user ID
+        :return: Session token or None
+        """
+        last = await self.backend.get(f'last:{id_user}')
+        return last['token'] if last else None
+
+    @property
+    def is_shared(self) -> bool:
+        """
+        Whether the result sets are visible to bot processes on other hosts.
+        """
+        return isinstance(self.backend, MySQLResultStoreBackend)
+
+
+def create_result_store() -> ResultSetStore:
+    """
+    Creates the result-set store with the backend selected in the settings.
+    """
+    if RESULT_STORE_BACKEND == 'mysql':
+        backend = MySQLResultStoreBackend(ttl=RESULT_STORE_TTL)
+    elif RESULT_STORE_BACKEND == 'sqlite':
+        backend = SqliteResultStoreBackend(path=RESULT_STORE_PATH, ttl=RESULT_STORE_TTL,
+                                           max_sessions=RESULT_STORE_MAX_SESSIONS)
+    else:
+        backend = MemoryResultStoreBackend(ttl=RESULT_STORE_TTL, max_sessions=RESULT_STORE_MAX_SESSIONS,
+                                           max_ids=RESULT_STORE_MAX_IDS)
+    return ResultSetStore(backend=backend)
+
+
+result_store = create_result_store()
+
+
+async def start_clean_result_sets():
+    """
+    Periodically evicts the expired result sets of the 'sqlite' and 'mysql' backends
+    (the 'memory' backend evicts on write).
+    """
+    if not hasattr(result_store.backend, 'delete_expired'):
+        return
+    while True:
+        try:
+            await result_store.backend.delete_expired()
+        except Exception as ex:
+            print(f'Result store: failed to delete expired result sets: {ex}')
+        await asyncio.sleep(CLEANUP_INTERVAL)
@@ -0,0 +1,76 @@
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from data.event_catalog import event_catalog
+
+# Columns the model may filter on, with a short description (agenda and html_event are left out)
+SEARCHABLE_COLUMNS = (
+    ('id_event', 'INT, primary key'),
+    ('name_event', 'VARCHAR, event name'),
+    ('date_event', 'VARCHAR, day of the event as text'),
+    ('time_event', 'VARCHAR, start and end time as text'),
+    ('location_event', 'VARCHAR, venue or address'),
+    ('host_event', 'VARCHAR, comma-separated hosts'),
+    ('speakers_event', 'VARCHAR, comma-separated speakers'),
+    ('tags_event', 'VARCHAR, comma-separated tags'),
+    ('description_event', 'TEXT, full description'),
+)
+
+MAX_TAGS = 40
+MAX_DAYS = 20
+MAX_LOCATIONS = 15
+MAX_VALUE_LENGTH = 40
+
+
+def _most_common(values: Iterable[str], limit: int) -> List[str]:
+    counts = Counter(value.strip()[:MAX_VALUE_LENGTH] for value in values if value and value.strip())
+    return [value for value, _ in counts.most_common(limit)]
+
+
+class SchemaContext:
+    """
+    Compact description of the events table for the NL -> SQL prompt.
+
+    Only the searchable columns of 'conference_events' are described, with the most common tags,
+    days and locations as value hints, instead of the DDL and sample rows of every table.
+    The text is built from the event catalog and rebuilt only when the catalog version changes.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.text = ''
+
+    def get(self) -> str:
+        """
+        Returns the schema context, rebuilding it if the catalog has changed.
+
+        :return: Schema context for the system prompt
+        """
+        if self.version is None or (event_catalog.loaded and event_catalog.version != self.version):
+            self.text = self._build(list(event_catalog.events.values()) if event_catalog.loaded else [])
+            self.version = event_catalog.version if event_catalog.loaded else None
+        return self.text
+
+    @staticmethod
+    def _build(events: List[Dict]) -> str:
+        lines = ['MySQL table conference_events:']
+        lines += [f'- {column}: {description}' for column, description in SEARCHABLE_COLUMNS]
+
+        if events:
+            tags = _most_common((tag for event in events for tag in (event['tags_event'] or '').split(',')),
+                                MAX_TAGS)
+            days = _most_common((event['date_event'] for event in events), MAX_DAYS)
+            locations = _most_common((event['location_event'] for event in events), MAX_LOCATIONS)
+            lines += [
+                f'tags_event values: {", ".join(tags)}',
+                f'date_event values: {", ".join(days)}',
+                f'Frequent location_event values: {", ".join(locations)}',
+            ]
+
+        lines.append('Answer with one query: SELECT id_event FROM conference_events WHERE ... '
+                     '(use LIKE \'%...%\' for text columns).')
+        return '\n'.join(lines)
+
+
+# Shared schema context used by the NL -> SQL prompt
+schema_context = SchemaContext()
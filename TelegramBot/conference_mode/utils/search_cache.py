@@ -0,0 +1,110 @@
+import re
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, List
+
+from data.event_catalog import event_catalog
+from TelegramBot.conference_mode.conference_routers.gaianet_sql import generate_sql, execute_generated_sql
+from TelegramBot.conference_mode.utils.local_search import tokenize
+from TelegramBot.settings.config import SEARCH_CACHE_MAXSIZE
+from TelegramBot.utils.single_flight import SingleFlight
+
+def normalize_query(query: str) -> str:
+    """
+    Reduces a free-text query to its meaningful words: lower case, without punctuation,
+    extra whitespace and stop words. Queries that differ only in these get the same cache key.
+
+    :param query: User's natural language query
+    :return: Normalized query
+    """
+    return ' '.join(tokenize(query)) or ' '.join(re.findall(r'\w+', query.lower()))
+
+
+class SearchCache:
+    """
+    Cache of the free-text search (natural language -> SQL -> event IDs).
+
+    Entries are keyed by the normalized query and keep both the SQL generated by the LLM and the event IDs
+    it returned. The IDs are valid only for the catalog version they were found in; after the catalog changes
+    the stored SQL is executed again, so the LLM is asked only for queries it has never seen.
+    Concurrent searches with the same normalized query share one lookup.
+
+    :param maxsize: Maximum number of cached queries
+    """
+
+    def __init__(self, maxsize: int = SEARCH_CACHE_MAXSIZE):
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.sql_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self.coalesced = 0
+        self._in_flight = SingleFlight()
+
+    async def search(self, query: str, user_id: int = None) -> List[int]:
+        """
+        Finds the events matching a free-text query.
+
+        :param query: User's natural language query
+        :param user_id: Telegram ID of the user who asked
+        :return: List of event IDs
+        """
+        key = normalize_query(query)
+        entry = self.entries.get(key)
+        if entry is not None and entry['version'] == event_catalog.version:
+            self.entries.move_to_end(key)
+            self.saved_seconds += entry['llm_seconds']
+            self.hits += 1
+            return entry['ids']
+
+        if self._in_flight.is_in_flight(key):
+            self.coalesced += 1
+        return await self._in_flight.do(key=key, func=lambda: self._lookup(key=key, query=query, user_id=user_id))
+
+    async def _lookup(self, key: str, query: str, user_id: int = None) -> List[int]:
+        version = event_catalog.version
+        entry = self.entries.get(key)
+
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.saved_seconds += entry['llm_seconds']
+            self.sql_hits += 1
+            ids = await execute_generated_sql(sql=entry['sql'], query=query)
+            self.entries[key] = {**entry, 'ids': ids, 'version': version}
+            return ids
+
+        self.misses += 1
+        started = monotonic()
+        sql = await generate_sql(query=query, user_id=user_id)
+        llm_seconds = monotonic() - started
+        ids = await execute_generated_sql(sql=sql, query=query)
+
+        self.entries[key] = {'sql': sql, 'ids': ids, 'version': version, 'llm_seconds': llm_seconds}
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return ids
+
+    def stats(self) -> Dict:
+        """
+        Returns the cache metrics.
+
+        :return: Dictionary with the number of entries, hits, misses, coalesced searches, hit rate
+                 and saved LLM seconds
+        """
+        # Coalesced searches waited for another search instead of calling the LLM, so they count as hits
+        served = self.hits + self.sql_hits + self.coalesced
+        requests = served + self.misses
+        return {
+            'size': len(self.entries),
+            'hits': self.hits + self.sql_hits,
+            'sql_hits': self.sql_hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'hit_rate': served / requests if requests else 0.0,
+            'saved_seconds': self.saved_seconds,
+        }
+
+
+# Shared cache used by the free-text search
+search_cache = SearchCache()
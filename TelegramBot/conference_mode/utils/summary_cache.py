@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+from typing import Dict, Tuple
+
+from data.async_database import SummaryDB
+from data.event_catalog import event_catalog
+from TelegramBot.conference_mode.conference_routers.generate_short_description import generate_short_description
+from TelegramBot.settings.config import SUMMARY_WARMUP_INTERVAL, SUMMARY_WARMUP_BATCH, SUMMARY_WARMUP_PAUSE
+from TelegramBot.utils.single_flight import SingleFlight
+from TelegramBot.utils.llm_scheduler import INTERACTIVE, BACKGROUND
+
+
+def description_hash(description: str) -> str:
+    """
+    Returns the hash identifying the content of an event description.
+    """
+    return hashlib.md5(description.encode()).hexdigest()
+
+
+class SummaryCache:
+    """
+    Read-through cache of the AI summaries of event descriptions.
+
+    Summaries are kept in memory and in the 'event_summaries' table, keyed by event ID together with
+    the hash of the description, so a changed description is summarized again and an unchanged one never is.
+    `warm_up` generates the missing summaries in small batches, so detail views usually hit the cache.
+    Concurrent requests for the same summary share one LLM call. If the LLM is unavailable,
+    the stored summary of the previous description is returned when there is one.
+    """
+
+    def __init__(self):
+        self.database = SummaryDB()
+        self.summaries: Dict[int, Tuple[str, str]] = {}  # id_event -> (description hash, summary)
+        self._warmed_version = None
+        self._in_flight = SingleFlight()
+
+    async def get_summary(self, id_event: int, description: str, user_id: int = None,
+                          priority: int = INTERACTIVE) -> str:
+        """
+        Returns the summary of the event description, generating and storing it if needed.
+
+        :param id_event: Event ID
+        :param description: Current description of the event
+        :param user_id: Telegram ID of the user waiting for the summary (None for background jobs)
+        :param priority: Priority of the LLM request
+        :return: AI generated summary
+        """
+        content_hash = description_hash(description)
+
+        cached = self.summaries.get(id_event)
+        if cached is not None and cached[0] == content_hash:
+            return cached[1]
+
+        # A user does not join a queued background job, it would make them wait behind the warm-up
+        return await self._in_flight.do(
+            key=(id_event, content_hash, priority),
+            func=lambda: self._load_or_generate(id_event=id_event, description=description, content_hash=content_hash,
+                                                user_id=user_id, priority=priority)
+        )
+
+    async def _load_or_generate(self, id_event: int, description: str, content_hash: str, user_id: int,
+                                priority: int) -> str:
+        stored = await self.database.get_summary(id_event=id_event)
+        if stored is not None and stored['description_hash'] == content_hash:
+            self.summaries[id_event] = (content_hash, stored['summary'])
+            return stored['summary']
+
+        try:
+            summary = await generate_short_description(full_description=description, user_id=user_id,
+                                                       priority=priority)
+        except Exception:
+            if stored is not None and priority == INTERACTIVE:
+                return stored['summary']  # Outdated, but better than nothing
+            raise
+        await self.database.save_summary(id_event=id_event, description_hash=content_hash, summary=summary)
+        self.summaries[id_event] = (content_hash, summary)
+        return summary
+
+    async def warm_up(self):
+        """
+        Generates the summaries of the catalog events that have no summary for their current description.
+        Does nothing if the catalog has not changed since the last complete pass.
+        """
+        version = event_catalog.version
+        if not event_catalog.loaded or version == self._warmed_version:
+            return
+
+        stored_hashes = await self.database.get_summary_hashes()
+        pending = [(id_event, event['description_event']) for id_event, event in event_catalog.events.items()
+                   if event['description_event']
+                   and stored_hashes.get(id_event) != description_hash(event['description_event'])]
+
+        failed = 0
+        for start in range(0, len(pending), SUMMARY_WARMUP_BATCH):
+            batch = pending[start:start + SUMMARY_WARMUP_BATCH]
+            results = await asyncio.gather(
+                *(self.get_summary(id_event=id_event, description=description, priority=BACKGROUND)
+                  for id_event, description in batch),
+                return_exceptions=True
+            )
+            failed += sum(isinstance(result, Exception) for result in results)
+            await asyncio.sleep(SUMMARY_WARMUP_PAUSE)
+
+        if pending:
+            print(f'Summaries generated: {len(pending) - failed}, failed: {failed}')
+        if not failed:
+            self._warmed_version = version
+
+
+# Shared summary cache used by the event detail view
+summary_cache = SummaryCache()
+
+
+async def start_warm_up_summaries():
+    """
+    Periodically generates the summaries of new and updated events.
+    """
+    while True:
+        try:
+            await summary_cache.warm_up()
+        except Exception as ex:
+            print(f'Summary warm-up failed: {ex}')
+        await asyncio.sleep(SUMMARY_WARMUP_INTERVAL)
@@ -3,7 +3,7 @@ from aiogram.types import Message
 from aiogram import Router, Bot
 from aiogram.enums.parse_mode import ParseMode
 
-from data.async_database import UserDB, ListEvents
+from data.async_database import UserDB
 from TelegramBot.conference_mode.keyboards.builders import admin_keyboard
 from TelegramBot.utils.log_message import log_message
 from TelegramBot.middleware.middlewares import IsAdmin
@@ -46,18 +46,13 @@ async def set_mode_conference(message: Message, bot: Bot):
 async def start(message: Message, bot: Bot):
     """
     Command handler to initiate the bot and set up the user's profile.
-    It ensures the user has a private list of events and inserts them into the database if they are new.
+    It creates the user with their private and public lists of events if they are new (one transaction).
 
     :param message: Incoming message from the user.
     :param bot: Bot instance.
     :return: Two welcome messages introducing the bot.
     """
-    list_events = ListEvents()
-    tg_id = message.from_user.id
-    tg_username = message.from_user.username
-
-    await list_events.check_private_list_user_and_create_if_none(tg_id_user=tg_id, username=tg_username)
-    await User.insert_new_user(tg_id=tg_id, tg_username=tg_username)
+    await User.onboard_user(tg_id=message.from_user.id, tg_username=message.from_user.username)
 
     reply_reply = await main_keyboard_conference_mode()
     await message.answer(text=config_texts.msg_for_start_1, reply_markup=reply_reply, parse_mode=ParseMode.MARKDOWN)
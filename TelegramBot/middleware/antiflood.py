@@ -1,53 +1,47 @@
-import asyncio
-from time import time as timeSeconds
 from typing import Any, Awaitable, Callable, Dict
 
-from aiogram.types import Message
+from aiogram.types import TelegramObject
 from aiogram.dispatcher.middlewares.base import BaseMiddleware
-from aiogram.enums.parse_mode import ParseMode
+
+from TelegramBot.settings.config import ANTIFLOOD_MESSAGE_LIMIT, ANTIFLOOD_CALLBACK_LIMIT, ANTIFLOOD_WINDOW, \
+    ANTIFLOOD_MAX_USERS
+from TelegramBot.utils.rate_limiter import SlidingWindowLimiter
+
+FLOOD_WARNING = 'The bot is free so we ask you to cooldown for 1 minute and not to rug us 🤖'
+
+# Separate limits for messages and button presses, shared with the admin statistics
+message_limiter = SlidingWindowLimiter(limit=ANTIFLOOD_MESSAGE_LIMIT, window=ANTIFLOOD_WINDOW,
+                                       max_keys=ANTIFLOOD_MAX_USERS)
+callback_limiter = SlidingWindowLimiter(limit=ANTIFLOOD_CALLBACK_LIMIT, window=ANTIFLOOD_WINDOW,
+                                        max_keys=ANTIFLOOD_MAX_USERS)
+
 
 class AntiFloodMiddleware(BaseMiddleware):
     """
-    Middleware that prevents users from sending too many messages in a short period of time (anti-flood protection).
-    If a user sends more than 9 messages in under a minute, they will be temporarily blocked for 1 minute.
+    Middleware that prevents users from sending too many updates in a short period of time (anti-flood protection).
+    Updates over the limit of the limiter are answered with a warning and not handled.
 
-    :dict_info: Stores the count of messages for each user to monitor the message rate.
+    :param limiter: Limiter for the update type the middleware is registered on
     """
-    dict_info = {}
 
-    def __init__(self, *args, **kwargs) -> None:
+    def __init__(self, limiter: SlidingWindowLimiter) -> None:
         super().__init__()
+        self.limiter = limiter
 
-    async def __call__(self, handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]], event: Message,
-                       data: Dict[str, Any]) -> Any:
+    async def __call__(self, handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+                       event: TelegramObject, data: Dict[str, Any]) -> Any:
         """
-        Intercepts the incoming message event, checks the rate of messages, and applies anti-flooding logic.
+        Intercepts the incoming message or callback query, checks the rate of updates of the user,
+        and applies anti-flooding logic.
 
         :param handler: The next handler to call if the user is not flooding.
-        :param event: The message event.
+        :param event: The message or callback query event.
         :param data: Additional context data.
         :return: The result of the handler or a warning message if the user is flooding.
         """
-        user_id = event.from_user.id
-        time = timeSeconds()
-
-        if not self.dict_info.get(user_id):
-            self.dict_info[user_id] = 0
-
-        asyncio.create_task(self.add_message(user_id=user_id))
+        user = getattr(event, 'from_user', None)
+        if user is None or self.limiter.hit(user.id):
+            return await handler(event, data)
 
-        if self.dict_info[user_id] > 9:
-            await event.answer(text='The bot is free so we ask you to cooldown for 1 minute and not to rug us 🤖')
-            return
-
-        return await handler(event, data)
-
-    async def add_message(self, user_id: int) -> None:
-        """
-        Increments the message count for the user and resets it after 60 seconds.
-
-        :param user_id: The ID of the user.
-        """
-        self.dict_info[user_id] += 1
-        await asyncio.sleep(60)
-        self.dict_info[user_id] -= 1
+        # Message.answer replies in the chat, CallbackQuery.answer shows a notification
+        await event.answer(text=FLOOD_WARNING)
@@ -0,0 +1,47 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram.types import Update
+from aiogram.dispatcher.middlewares.base import BaseMiddleware
+
+from TelegramBot.settings.config import PROCESSED_UPDATES_TTL
+from data.async_database import UpdatesDB
+
+updates_db = UpdatesDB()
+
+
+class UpdateDedupMiddleware(BaseMiddleware):
+    """
+    Outer update middleware that drops updates already received by any worker.
+    Telegram resends an update when the webhook did not answer in time, and behind a load balancer
+    the retry may reach another worker, so the update IDs are recorded in the database.
+    """
+
+    async def __call__(self, handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]], event: Update,
+                       data: Dict[str, Any]) -> Any:
+        """
+        Handles the update only if its ID was not recorded before.
+
+        :param handler: The next handler to call.
+        :param event: The incoming update.
+        :param data: Additional context data.
+        :return: The result of the handler, or None for a duplicate.
+        """
+        try:
+            if not await updates_db.mark_update_processed(update_id=event.update_id):
+                return
+        except Exception as ex:
+            print(f'Update {event.update_id} could not be recorded: {ex}')  # Better twice than never
+        return await handler(event, data)
+
+
+async def start_clean_processed_updates():
+    """
+    Periodically deletes the recorded update IDs older than PROCESSED_UPDATES_TTL.
+    """
+    while True:
+        try:
+            await updates_db.delete_old_updates(seconds=PROCESSED_UPDATES_TTL)
+        except Exception as ex:
+            print(f'Cleaning of processed updates failed: {ex}')
+        await asyncio.sleep(3600)
@@ -0,0 +1,33 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram.types import TelegramObject
+from aiogram.dispatcher.middlewares.base import BaseMiddleware
+
+from TelegramBot.utils.fsm_storage import BatchedFSMStorage
+
+
+class FSMFlushMiddleware(BaseMiddleware):
+    """
+    Outer update middleware that stores the FSM writes of the update once it is handled.
+    Only the key of the update is written, so the update does not wait for the writes of other users.
+    It runs inside aiogram's FSM middleware, so the writes are stored while the user's updates
+    are still locked and the next update of the user sees them. Across webhook workers this holds
+    because the lock also takes a MySQL lock of the user (UserOrderedIsolation.use_process_locks).
+    """
+
+    async def __call__(self, handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+                       event: TelegramObject, data: Dict[str, Any]) -> Any:
+        """
+        Handles the update, then flushes its FSM key.
+
+        :param handler: The next handler to call.
+        :param event: The incoming update.
+        :param data: Additional context data.
+        :return: The result of the handler.
+        """
+        try:
+            return await handler(event, data)
+        finally:
+            storage, state = data.get('fsm_storage'), data.get('state')
+            if isinstance(storage, BatchedFSMStorage) and state is not None:
+                await storage.flush(keys=[state.key])
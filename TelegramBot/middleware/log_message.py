@@ -49,7 +49,7 @@ class LoggingMiddleware(BaseMiddleware):
 
     async def log_message(self, user_id: int, user_message: str, bot_response: str, error: str, username: str):
         """
-        Logs the user message, bot response, and any errors to the database.
+        Queues the user message, bot response, and any errors for the background log writer.
 
         :param user_id: The ID of the user sending the message.
         :param user_message: The content of the user's message.
@@ -57,5 +57,4 @@ class LoggingMiddleware(BaseMiddleware):
         :param error: Any error that occurred during processing.
         :param username: The username of the user.
         """
-        log = LogsDB()
-        await log.log_message(user_id=user_id, username=username, message_text=user_message, response_text=bot_response, error_message=error)
+        await LogsDB().log_message(user_id=user_id, username=username, message_text=user_message, response_text=bot_response, error_message=error)
@@ -1,9 +1,37 @@
-from aiogram.types import Message
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram.types import Message, TelegramObject
 from aiogram.filters import BaseFilter
+from aiogram.dispatcher.middlewares.base import BaseMiddleware
 from TelegramBot.settings import config
 from data.async_database import UserDB
 
 
+class UserModeMiddleware(BaseMiddleware):
+    """
+    Outer middleware that resolves the user's chat mode once per update and stores it
+    in the middleware data as 'user_mode', so every UserModeFilter can reuse it.
+    'user_mode_resolved' tells the filters that a None mode means the user is not registered.
+    The mode is served from the in-process user cache, without a database round-trip on the hot path.
+    """
+
+    async def __call__(self, handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+                       event: TelegramObject, data: Dict[str, Any]) -> Any:
+        """
+        Resolves the user's chat mode and passes it to the next handler.
+
+        :param handler: The next handler to call.
+        :param event: The incoming event.
+        :param data: Additional context data.
+        :return: The result of the handler.
+        """
+        user = data.get('event_from_user')
+        if user is not None and not data.get('user_mode_resolved'):
+            data['user_mode'] = await UserDB().get_user_mode(tg_id=user.id)
+            data['user_mode_resolved'] = True
+        return await handler(event, data)
+
+
 class UserModeFilter(BaseFilter):
     """
     Filter that checks if the user's chat mode matches the specified mode.
@@ -14,18 +42,19 @@ class UserModeFilter(BaseFilter):
     def __init__(self, mode: str):
         self.mode = mode
 
-    async def __call__(self, message: Message) -> bool:
+    async def __call__(self, message: Message, user_mode: Optional[str] = None,
+                       user_mode_resolved: bool = False) -> bool:
         """
-        Checks the user's chat mode in the database and compares it with the desired mode.
+        Compares the user's chat mode with the desired mode.
+        Uses the mode resolved by UserModeMiddleware and queries it only if the middleware did not run.
 
         :param message: The incoming message to filter.
+        :param user_mode: The user's chat mode resolved by UserModeMiddleware.
+        :param user_mode_resolved: Whether UserModeMiddleware resolved the mode.
         :return: True if the user's mode matches the specified mode, False otherwise.
         """
-        db = UserDB()
-        await db.init()
-        user_mode = await db.get_user_info(tg_id=message.from_user.id)
-        user_mode = user_mode[0]['mode_chat']
-        await db.close()
+        if not user_mode_resolved:
+            user_mode = await UserDB().get_user_mode(tg_id=message.from_user.id)
 
         return user_mode == self.mode
 
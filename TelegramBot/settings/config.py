@@ -16,6 +16,107 @@ NEWS_USERNAME = os.getenv('NEWS_USERNAME')
 NEWS_PASSWORD = os.getenv('NEWS_PASSWORD')
 GAIANET_URL = os.getenv('GAIANET_URL')
 
+# MySQL connection pool settings (shared by all database classes)
+DB_POOL_MINSIZE = int(os.getenv('DB_POOL_MINSIZE', 1))
+DB_POOL_MAXSIZE = int(os.getenv('DB_POOL_MAXSIZE', 10))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 3600))  # Seconds before an idle connection is reopened
+DB_POOL_ACQUIRE_TIMEOUT = float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', 10))  # Seconds to wait for a free connection
+
+# In-process cache of user profiles (used for mode checks)
+USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 600))  # Seconds
+USER_CACHE_MAXSIZE = int(os.getenv('USER_CACHE_MAXSIZE', 50000))
+USER_CACHE_MISSING_TTL = int(os.getenv('USER_CACHE_MISSING_TTL', 60))  # Seconds an unknown user is remembered
+
+# Background log writer
+LOG_QUEUE_MAXSIZE = int(os.getenv('LOG_QUEUE_MAXSIZE', 10000))  # Rows kept in memory before new ones are dropped
+LOG_BATCH_SIZE = int(os.getenv('LOG_BATCH_SIZE', 200))
+LOG_FLUSH_INTERVAL = float(os.getenv('LOG_FLUSH_INTERVAL', 2))  # Seconds
+
+# In-memory event catalog
+CATALOG_REFRESH_INTERVAL = int(os.getenv('CATALOG_REFRESH_INTERVAL', 60))  # Seconds between incremental refreshes
+
+# Store of the event lists users page through
+RESULT_STORE_BACKEND = os.getenv('RESULT_STORE_BACKEND', 'memory')  # 'memory', 'sqlite' or 'mysql' (webhook.py)
+RESULT_STORE_PATH = os.getenv('RESULT_STORE_PATH', 'result_sets.sqlite3')  # Used by the 'sqlite' backend
+RESULT_STORE_TTL = int(os.getenv('RESULT_STORE_TTL', 6 * 3600))  # Seconds since the last access
+RESULT_STORE_MAX_SESSIONS = int(os.getenv('RESULT_STORE_MAX_SESSIONS', 50000))
+RESULT_STORE_MAX_IDS = int(os.getenv('RESULT_STORE_MAX_IDS', 2000000))  # Memory cap of the 'memory' backend
+
+# Notification broadcasts (Telegram allows about 30 messages per second in total)
+BROADCAST_RATE = float(os.getenv('BROADCAST_RATE', 25))  # Messages per second
+BROADCAST_CONCURRENCY = int(os.getenv('BROADCAST_CONCURRENCY', 10))  # Messages in flight
+BROADCAST_MAX_RETRIES = int(os.getenv('BROADCAST_MAX_RETRIES', 3))
+
+# Gaianet client
+GAIANET_TIMEOUT = float(os.getenv('GAIANET_TIMEOUT', 60))  # Seconds to wait for an answer
+GAIANET_SQL_TIMEOUT = float(os.getenv('GAIANET_SQL_TIMEOUT', 120))  # Seconds to wait for a generated SQL query
+GAIANET_CONNECT_TIMEOUT = float(os.getenv('GAIANET_CONNECT_TIMEOUT', 5))
+GAIANET_CONCURRENCY = int(os.getenv('GAIANET_CONCURRENCY', 4))  # Requests sent to the node at the same time
+GAIANET_MAX_CONNECTIONS = int(os.getenv('GAIANET_MAX_CONNECTIONS', 8))
+GAIANET_MAX_RETRIES = int(os.getenv('GAIANET_MAX_RETRIES', 1))
+
+# Background generation of AI summaries
+SUMMARY_WARMUP_INTERVAL = int(os.getenv('SUMMARY_WARMUP_INTERVAL', 300))  # Seconds between passes
+SUMMARY_WARMUP_BATCH = int(os.getenv('SUMMARY_WARMUP_BATCH', 3))  # Summaries generated at the same time
+SUMMARY_WARMUP_PAUSE = float(os.getenv('SUMMARY_WARMUP_PAUSE', 5))  # Seconds between batches
+
+# Cache of free-text search results
+SEARCH_CACHE_MAXSIZE = int(os.getenv('SEARCH_CACHE_MAXSIZE', 2000))  # Normalized queries kept in memory
+
+# Queue of LLM requests
+LLM_MAX_QUEUE = int(os.getenv('LLM_MAX_QUEUE', 50))  # Requests waiting at the same time
+LLM_MAX_QUEUED_PER_USER = int(os.getenv('LLM_MAX_QUEUED_PER_USER', 2))
+LLM_MAX_WAIT = float(os.getenv('LLM_MAX_WAIT', 20))  # Seconds a user's request may wait to start
+LLM_MAX_WAIT_BACKGROUND = float(os.getenv('LLM_MAX_WAIT_BACKGROUND', 600))  # Same for background jobs
+
+# Local free-text search (queries it cannot answer go to the LLM)
+LOCAL_SEARCH_MIN_COVERAGE = float(os.getenv('LOCAL_SEARCH_MIN_COVERAGE', 1.0))  # Share of query words found in events
+LOCAL_SEARCH_CUTOFF = float(os.getenv('LOCAL_SEARCH_CUTOFF', 0.35))  # Minimum score as a share of the best score
+LOCAL_SEARCH_MAX_RESULTS = int(os.getenv('LOCAL_SEARCH_MAX_RESULTS', 50))
+
+# Limits of the SQL generated by the LLM
+GENERATED_SQL_LIMIT = int(os.getenv('GENERATED_SQL_LIMIT', 200))  # Rows
+GENERATED_SQL_MAX_TIME_MS = int(os.getenv('GENERATED_SQL_MAX_TIME_MS', 2000))  # Server-side execution time
+
+# Circuit breaker of the Gaianet endpoint
+BREAKER_WINDOW = int(os.getenv('BREAKER_WINDOW', 20))  # Recent calls used to compute the failure rate
+BREAKER_MIN_CALLS = int(os.getenv('BREAKER_MIN_CALLS', 5))
+BREAKER_FAILURE_RATE = float(os.getenv('BREAKER_FAILURE_RATE', 0.5))  # Share of failed or slow calls that opens it
+BREAKER_SLOW_CALL = float(os.getenv('BREAKER_SLOW_CALL', 30))  # Seconds after which a call counts as failed
+BREAKER_OPEN_SECONDS = float(os.getenv('BREAKER_OPEN_SECONDS', 30))  # Seconds before probing again
+BREAKER_HALF_OPEN_PROBES = int(os.getenv('BREAKER_HALF_OPEN_PROBES', 2))
+
+# Admin alerts are sent as one digest per interval
+ALERT_INTERVAL = int(os.getenv('ALERT_INTERVAL', 300))  # Seconds
+
+# Anti-flood limits per update type
+ANTIFLOOD_MESSAGE_LIMIT = int(os.getenv('ANTIFLOOD_MESSAGE_LIMIT', 10))  # Messages per window
+ANTIFLOOD_CALLBACK_LIMIT = int(os.getenv('ANTIFLOOD_CALLBACK_LIMIT', 30))  # Button presses per window
+ANTIFLOOD_WINDOW = float(os.getenv('ANTIFLOOD_WINDOW', 60))  # Seconds
+ANTIFLOOD_MAX_USERS = int(os.getenv('ANTIFLOOD_MAX_USERS', 100000))  # Users tracked per update type
+
+# Updates of one user are handled in order, updates of different users in parallel
+UPDATE_CONCURRENCY = int(os.getenv('UPDATE_CONCURRENCY', 32))  # Updates handled at the same time
+
+# FSM storage ('mysql' keeps states across restarts and shares them between workers, required by webhook.py;
+# 'memory' needs no database reads and is enough for polling in one process)
+FSM_STORAGE = os.getenv('FSM_STORAGE', 'memory')
+FSM_STATE_TTL = int(os.getenv('FSM_STATE_TTL', 86400))  # Seconds after which an unchanged state is deleted
+
+# Webhook mode (webhook.py): several workers behind a load balancer
+WEBHOOK_BASE_URL = os.getenv('WEBHOOK_BASE_URL')  # Public HTTPS address of the load balancer
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/webhook')
+WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET')  # Checked against the X-Telegram-Bot-Api-Secret-Token header
+WEBHOOK_HOST = os.getenv('WEBHOOK_HOST', '0.0.0.0')
+WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', 8080))
+PROCESSED_UPDATES_TTL = int(os.getenv('PROCESSED_UPDATES_TTL', 86400))  # Seconds update IDs are kept for dedup
+LEADER_LOCK_NAME = os.getenv('LEADER_LOCK_NAME', 'tgbot_leader')  # MySQL lock of the worker running the jobs
+LEADER_CHECK_INTERVAL = float(os.getenv('LEADER_CHECK_INTERVAL', 15))  # Seconds
+UPDATE_LOCK_TIMEOUT = float(os.getenv('UPDATE_LOCK_TIMEOUT', 30))  # Seconds to wait for the user's update on another worker
+
+# Startup
+STARTUP_IMPORT_BUDGET = float(os.getenv('STARTUP_IMPORT_BUDGET', 3))  # Seconds to import the bot package
+
 def get_url_database():
     """
     Constructs the URL for connecting to the MySQL database using the environment variables.
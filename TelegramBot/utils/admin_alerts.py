@@ -0,0 +1,77 @@
+import asyncio
+from collections import Counter
+from typing import Dict, List
+
+from aiogram import Bot
+
+from TelegramBot.settings.config import ADMINS_IDS, ALERT_INTERVAL
+
+# Examples kept per kind of alert for the digest
+MAX_SAMPLES = 3
+
+
+class AdminAlerts:
+    """
+    Collects problems reported by the handlers and sends them to the admins as one digest
+    every `interval` seconds, so an outage produces one message instead of one per request.
+
+    :param interval: Seconds between digests
+    """
+
+    def __init__(self, interval: float = ALERT_INTERVAL):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.samples: Dict[str, List[str]] = {}
+
+    def report(self, kind: str, text: str = '') -> None:
+        """
+        Registers a problem.
+
+        :param kind: Short name of the problem, alerts are grouped by it
+        :param text: Details of one occurrence
+        """
+        self.counts[kind] += 1
+        samples = self.samples.setdefault(kind, [])
+        if text and len(samples) < MAX_SAMPLES:
+            samples.append(text[:300])
+
+    def build_digest(self) -> str:
+        """
+        Returns the digest of the problems reported since the last one and starts a new period.
+        """
+        counts, samples = self.counts, self.samples
+        self.counts, self.samples = Counter(), {}
+
+        lines = [f'⚠️ Alerts for the last {int(self.interval)} s']
+        for kind, count in counts.most_common():
+            lines.append(f'\n{kind}: {count}')
+            lines += [f'  • {sample}' for sample in samples.get(kind, [])]
+        return '\n'.join(lines)
+
+    async def send(self, bot: Bot) -> None:
+        """
+        Sends the digest to every admin if any problem was reported.
+        """
+        if not self.counts:
+            return
+        digest = self.build_digest()
+        for admin_id in ADMINS_IDS:
+            try:
+                await bot.send_message(chat_id=admin_id, text=digest)
+            except Exception as ex:
+                print(f'Alert to {admin_id} failed: {ex}')
+
+
+# Shared alert collector
+admin_alerts = AdminAlerts()
+
+
+async def start_admin_alerts(bot: Bot):
+    """
+    Periodically sends the collected alerts to the admins.
+
+    :param bot: Instance of the bot used to send the digests
+    """
+    while True:
+        await asyncio.sleep(admin_alerts.interval)
+        await admin_alerts.send(bot=bot)
@@ -20,12 +20,12 @@ def check_subscription():
             # user = UserDB()
             # if info_user.status != 'left':
             #     user = UserDB()
-            #     await user.insert_new_user(tg_id=message.from_user.id, tg_username=message.from_user.username)
+            #     await user.onboard_user(tg_id=message.from_user.id, tg_username=message.from_user.username)
             #     response = await func(message, *args, **kwargs)
             #     # Логирование успешного ответа
             #     return response
             # else:
-            #     await user.insert_new_user(tg_id=message.from_user.id, tg_username=message.from_user.username)
+            #     await user.onboard_user(tg_id=message.from_user.id, tg_username=message.from_user.username)
             #     keyboards = keyboard_check_subscription()
             #     await message.answer('Our bot’s totally free, just here to make your life easier. If you’re vibing with it, do us a solid and join @cryptosummary_eth to get AI generated market updates.\nThanks for the support! 🙏', parse_mode=ParseMode.HTML, reply_markup=keyboards)
         return wrapper
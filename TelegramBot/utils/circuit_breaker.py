@@ -0,0 +1,127 @@
+import asyncio
+from collections import deque
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from TelegramBot.settings.config import BREAKER_WINDOW, BREAKER_MIN_CALLS, BREAKER_FAILURE_RATE, BREAKER_SLOW_CALL, \
+    BREAKER_OPEN_SECONDS, BREAKER_HALF_OPEN_PROBES
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpen(Exception):
+    """
+    Raised instead of calling a backend that is considered down.
+    """
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a slow or failing backend.
+
+    The outcome of the last `window` calls is kept; calls slower than `slow_call` seconds count as failures.
+    When at least `min_calls` were made and the share of failures reaches `failure_rate`, the circuit opens
+    and calls fail right away with CircuitOpen. After `open_seconds` it becomes half-open and lets
+    `half_open_probes` calls through: if they all succeed the circuit closes, any failure opens it again.
+
+    :param name: Name of the backend, used in state change notifications
+    :param on_state_change: Function called with (name, old state, new state)
+    """
+
+    def __init__(self, name: str, window: int = BREAKER_WINDOW, min_calls: int = BREAKER_MIN_CALLS,
+                 failure_rate: float = BREAKER_FAILURE_RATE, slow_call: float = BREAKER_SLOW_CALL,
+                 open_seconds: float = BREAKER_OPEN_SECONDS, half_open_probes: int = BREAKER_HALF_OPEN_PROBES,
+                 on_state_change: Optional[Callable[[str, str, str], None]] = None):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call = slow_call
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.on_state_change = on_state_change
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._outcomes = deque(maxlen=window)  # True for a failed or slow call
+        self._probes_started = 0
+        self._probes_passed = 0
+
+    async def call(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Calls `func()` unless the circuit is open.
+
+        :param func: Function returning the awaitable that calls the backend
+        :return: Result of the call
+        :raises CircuitOpen: If the backend is considered down
+        """
+        self._before_call()
+        started = monotonic()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            if self.state == HALF_OPEN:
+                self._probes_started -= 1  # The probe gave no answer, let another call try
+            raise
+        except Exception:
+            self._record(failed=True)
+            raise
+        self._record(failed=monotonic() - started > self.slow_call)
+        return result
+
+    def allows_calls(self) -> bool:
+        """
+        Returns whether a call would currently be let through.
+        """
+        if self.state == OPEN and monotonic() - self.opened_at >= self.open_seconds:
+            return True
+        return self.state == CLOSED or (self.state == HALF_OPEN and self._probes_started < self.half_open_probes)
+
+    def stats(self) -> Dict:
+        """
+        Returns the state of the circuit and the failure rate of the recent calls.
+        """
+        calls = len(self._outcomes)
+        return {
+            'state': self.state,
+            'recent_calls': calls,
+            'failure_rate': sum(self._outcomes) / calls if calls else 0.0,
+            'rejected': self.rejected,
+        }
+
+    def _before_call(self) -> None:
+        if self.state == OPEN and monotonic() - self.opened_at >= self.open_seconds:
+            self._set_state(HALF_OPEN)
+            self._probes_started = 0
+            self._probes_passed = 0
+        if self.state == OPEN or (self.state == HALF_OPEN and self._probes_started >= self.half_open_probes):
+            self.rejected += 1
+            raise CircuitOpen(f'{self.name} is unavailable')
+        if self.state == HALF_OPEN:
+            self._probes_started += 1
+
+    def _record(self, failed: bool) -> None:
+        if self.state == HALF_OPEN:
+            if failed:
+                self._open()
+            else:
+                self._probes_passed += 1
+                if self._probes_passed >= self.half_open_probes:
+                    self._outcomes.clear()
+                    self._set_state(CLOSED)
+            return
+
+        self._outcomes.append(failed)
+        calls = len(self._outcomes)
+        if self.state == CLOSED and calls >= self.min_calls and sum(self._outcomes) / calls >= self.failure_rate:
+            self._open()
+
+    def _open(self) -> None:
+        self.opened_at = monotonic()
+        self._set_state(OPEN)
+
+    def _set_state(self, state: str) -> None:
+        old_state, self.state = self.state, state
+        if old_state != state and self.on_state_change is not None:
+            self.on_state_change(self.name, old_state, state)
@@ -0,0 +1,164 @@
+import asyncio
+import json
+from dataclasses import astuple
+from typing import Any, Dict, Iterable, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from TelegramBot.settings.config import FSM_STORAGE, FSM_STATE_TTL
+from data.async_database import FSMStateDB
+
+# Seconds between deletions of stale states
+CLEANUP_INTERVAL = 3600
+
+
+class BatchedFSMStorage(BaseStorage):
+    """
+    FSM storage kept in the MySQL table 'fsm_states', so states survive restarts and are shared
+    by the webhook workers (FSM_STORAGE = 'mysql', required by webhook.py).
+
+    A handler's writes (e.g. set_state followed by update_data) only change an in-process buffer;
+    FSMFlushMiddleware flushes the key of the update when it is handled, so they become one database
+    write that is stored before the next update of the user is handled, by this worker or another one.
+    Flushes of different keys run independently, a key being written is skipped by other flushes.
+    Reads of a buffered key are served from the buffer, other reads go to the database.
+    States not changed for `ttl` seconds are deleted by start_clean_fsm_states.
+
+    :param database: Database instance providing the FSMStateDB methods
+    :param ttl: Seconds after which an unchanged state is deleted
+    """
+
+    def __init__(self, database=None, ttl: int = FSM_STATE_TTL):
+        self.database = database if database is not None else FSMStateDB()
+        self.ttl = ttl
+        self._buffer: Dict[StorageKey, list] = {}  # key -> [state, data] not stored yet (or being stored)
+        self._dirty = set()
+        self._in_flight = set()  # Keys being written
+        self.buffer_hits = 0
+        self.database_reads = 0
+        self.flushed = 0
+
+    @staticmethod
+    def _row_key(key: StorageKey) -> str:
+        return ':'.join('' if part is None else str(part) for part in astuple(key))
+
+    async def _get_entry(self, key: StorageKey) -> list:
+        entry = self._buffer.get(key)
+        if entry is not None:
+            self.buffer_hits += 1
+            return entry
+
+        self.database_reads += 1
+        row = await self.database.get_fsm_state(fsm_key=self._row_key(key))
+        entry = self._buffer.get(key)  # Written while the row was being read
+        if entry is not None:
+            return entry
+        return [row['state'], json.loads(row['data'])] if row else [None, {}]
+
+    def _set_entry(self, key: StorageKey, state: Optional[str], data: Dict[str, Any]) -> None:
+        self._buffer[key] = [state, data]
+        self._dirty.add(key)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        state = state.state if isinstance(state, State) else state
+        entry = await self._get_entry(key)
+        self._set_entry(key, state, entry[1])
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return (await self._get_entry(key))[0]
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        entry = await self._get_entry(key)
+        self._set_entry(key, entry[0], data.copy())
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        return (await self._get_entry(key))[1].copy()
+
+    async def flush(self, keys: Optional[Iterable[StorageKey]] = None) -> None:
+        """
+        Writes buffered states to the database. States that could not be written
+        (error or cancellation) stay buffered and are written by the next flush.
+
+        :param keys: Keys to write; all buffered keys if None
+        """
+        pending = self._dirty if keys is None else self._dirty.intersection(keys)
+        keys = pending - self._in_flight
+        if not keys:
+            return
+        self._dirty -= keys
+        self._in_flight |= keys
+
+        rows, empty = [], []
+        for key in keys:
+            state, data = self._buffer[key]
+            if state is None and not data:
+                empty.append((self._row_key(key),))
+            else:
+                rows.append((self._row_key(key), state, json.dumps(data)))
+
+        written = False
+        try:
+            if rows:
+                await self.database.save_fsm_states(rows=rows)
+            if empty:
+                await self.database.delete_fsm_states(fsm_keys=empty)
+            written = True
+            self.flushed += len(keys)
+        except Exception as ex:
+            print(f'FSM storage: failed to write {len(keys)} states: {ex}')
+        finally:
+            self._in_flight -= keys
+            if written:
+                for key in keys:
+                    if key not in self._dirty:  # Unless written again in the meantime
+                        self._buffer.pop(key, None)
+            else:
+                self._dirty |= keys
+
+    async def delete_stale_states(self) -> None:
+        """
+        Deletes the states not changed for `ttl` seconds.
+        """
+        await self.database.delete_stale_fsm_states(seconds=self.ttl)
+
+    async def close(self) -> None:
+        """
+        Writes the buffered states.
+        """
+        await self.flush()
+
+    def stats(self) -> Dict:
+        """
+        Returns the counters of the storage for monitoring.
+        """
+        return {'buffered': len(self._buffer), 'dirty': len(self._dirty), 'buffer_hits': self.buffer_hits,
+                'database_reads': self.database_reads, 'flushed': self.flushed}
+
+
+def create_fsm_storage() -> BaseStorage:
+    """
+    Creates the FSM storage selected by FSM_STORAGE: 'memory' (default) or 'mysql'.
+    """
+    if FSM_STORAGE == 'memory':
+        return MemoryStorage()
+    return BatchedFSMStorage()
+
+
+# Shared FSM storage passed to the dispatcher
+fsm_storage = create_fsm_storage()
+
+
+async def start_clean_fsm_states():
+    """
+    Periodically deletes the FSM states not changed for FSM_STATE_TTL seconds.
+    """
+    if not isinstance(fsm_storage, BatchedFSMStorage):
+        return
+    while True:
+        try:
+            await fsm_storage.delete_stale_states()
+        except Exception as ex:
+            print(f'FSM storage: failed to delete stale states: {ex}')
+        await asyncio.sleep(CLEANUP_INTERVAL)
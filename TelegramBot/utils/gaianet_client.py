@@ -0,0 +1,78 @@
+import asyncio
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from TelegramBot.settings.config import GAIANET_URL, GAIANET_TIMEOUT, GAIANET_CONNECT_TIMEOUT, \
+    GAIANET_CONCURRENCY, GAIANET_MAX_CONNECTIONS, GAIANET_MAX_RETRIES
+from TelegramBot.utils.circuit_breaker import CircuitBreaker
+from TelegramBot.utils.admin_alerts import admin_alerts
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+class GaianetClient:
+    """
+    Asynchronous client for the Gaianet node (OpenAI-compatible API).
+
+    All calls share one pooled HTTP connection, have a timeout and are limited by a semaphore,
+    so a slow node never blocks the event loop and never gets more requests than it can serve.
+    Calls go through a circuit breaker: while the node is down they fail right away with CircuitOpen.
+    The underlying client (and the openai package) is loaded on first use.
+
+    :param concurrency: Maximum number of requests sent to the node at the same time
+    """
+
+    def __init__(self, concurrency: int = GAIANET_CONCURRENCY):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self._client: Optional['AsyncOpenAI'] = None
+
+    @property
+    def client(self) -> 'AsyncOpenAI':
+        if self._client is None:
+            import httpx
+            from openai import AsyncOpenAI
+
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=GAIANET_MAX_CONNECTIONS,
+                                    max_keepalive_connections=GAIANET_MAX_CONNECTIONS),
+                timeout=httpx.Timeout(GAIANET_TIMEOUT, connect=GAIANET_CONNECT_TIMEOUT)
+            )
+            self._client = AsyncOpenAI(base_url=GAIANET_URL, http_client=http_client, max_retries=GAIANET_MAX_RETRIES)
+        return self._client
+
+    async def chat(self, messages: List[Dict], model: str, timeout: float = GAIANET_TIMEOUT, **kwargs) -> str:
+        """
+        Sends a chat completion request and returns the text of the answer.
+
+        :param messages: Chat messages
+        :param model: Model name
+        :param timeout: Seconds to wait for the answer
+        :param kwargs: Other parameters of the completion (temperature, max_tokens, ...)
+        :return: Content of the first choice
+        """
+        async with self.semaphore:
+            response = await gaianet_breaker.call(lambda: self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                timeout=timeout,
+                **kwargs
+            ))
+        return response.choices[0].message.content
+
+    async def close(self):
+        """
+        Closes the HTTP connections of the client.
+        """
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+def _report_state_change(name: str, old_state: str, new_state: str):
+    print(f'{name} circuit: {old_state} -> {new_state}')
+    admin_alerts.report(f'{name} circuit', f'{old_state} -> {new_state}')
+
+
+# Shared breaker and client for all Gaianet calls
+gaianet_breaker = CircuitBreaker(name='Gaianet', on_state_change=_report_state_change)
+gaianet_client = GaianetClient()
@@ -0,0 +1,40 @@
+import asyncio
+from typing import Awaitable, Callable, List
+
+from TelegramBot.settings.config import LEADER_LOCK_NAME, LEADER_CHECK_INTERVAL
+from data.async_database import LeaderLock
+
+
+async def run_as_leader(jobs: Callable[[], List[Awaitable]], lock_name: str = LEADER_LOCK_NAME,
+                        interval: float = LEADER_CHECK_INTERVAL):
+    """
+    Runs the background jobs in only one of the processes sharing the database.
+
+    Every process keeps trying to take the leader lock; the one holding it starts the jobs and checks
+    the lock every `interval` seconds. When the lock is lost (e.g. the database connection dropped)
+    the jobs are cancelled and another process takes over.
+
+    :param jobs: Function returning the coroutines of the jobs
+    :param lock_name: Name of the MySQL lock
+    :param interval: Seconds between attempts to take or check the lock
+    """
+    lock = LeaderLock(name=lock_name)
+    while True:
+        try:
+            elected = await lock.try_acquire()
+        except Exception as ex:
+            print(f'Leader election failed: {ex}')
+            elected = False
+        if elected:
+            print('Elected leader, starting background jobs')
+            tasks = [asyncio.create_task(job) for job in jobs()]
+            try:
+                while await lock.is_held():
+                    await asyncio.sleep(interval)
+                print('Leadership lost, stopping background jobs')
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                await lock.release()
+        await asyncio.sleep(interval)
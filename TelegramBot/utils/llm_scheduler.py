@@ -0,0 +1,161 @@
+import asyncio
+from collections import OrderedDict, deque
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from TelegramBot.settings.config import GAIANET_CONCURRENCY, LLM_MAX_QUEUE, LLM_MAX_QUEUED_PER_USER, LLM_MAX_WAIT, \
+    LLM_MAX_WAIT_BACKGROUND
+
+# Priorities: interactive requests (a user is waiting) always go before background jobs (summary warm-up)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+
+class SchedulerBusy(Exception):
+    """
+    Raised when a request is rejected because the queue is full or it waited too long to start.
+    """
+
+
+class _Job:
+    def __init__(self, func: Callable[[], Awaitable[Any]], user_id: Optional[Hashable], priority: int):
+        self.func = func
+        self.user_id = user_id
+        self.priority = priority
+        self.enqueued_at = monotonic()
+        self.started = asyncio.get_running_loop().create_future()
+        self.task: Optional[asyncio.Task] = None
+
+
+class LLMScheduler:
+    """
+    Queue in front of the LLM backend.
+
+    At most `concurrency` requests run at the same time, the rest wait in a bounded queue.
+    Interactive requests are started before background ones, and within a priority users are served
+    round-robin, so one user sending many requests cannot starve the others. A request is rejected
+    with SchedulerBusy right away if the queue of its priority (or the user's share of it) is full,
+    and when it waits longer than the deadline of its priority, so the user gets a quick answer
+    instead of a long hang.
+
+    :param concurrency: Requests running at the same time
+    :param max_queue: Requests of one priority waiting at the same time
+    :param max_queued_per_user: Requests of one user waiting at the same time (not applied to background jobs)
+    :param max_wait: Seconds a request may wait to start, by priority
+    """
+
+    def __init__(self, concurrency: int = GAIANET_CONCURRENCY, max_queue: int = LLM_MAX_QUEUE,
+                 max_queued_per_user: int = LLM_MAX_QUEUED_PER_USER, max_wait: Optional[Dict[int, float]] = None):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_queued_per_user = max_queued_per_user
+        self.max_wait = max_wait or {INTERACTIVE: LLM_MAX_WAIT, BACKGROUND: LLM_MAX_WAIT_BACKGROUND}
+        # priority -> user ID -> jobs of the user in arrival order
+        self._queues: Dict[int, OrderedDict] = {INTERACTIVE: OrderedDict(), BACKGROUND: OrderedDict()}
+        self._queued = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.expired = 0
+        self.max_wait_seen = 0.0
+
+    async def submit(self, func: Callable[[], Awaitable[Any]], user_id: Optional[Hashable] = None,
+                     priority: int = INTERACTIVE) -> Any:
+        """
+        Runs `func()` when a slot is free and returns its result.
+
+        :param func: Function returning the awaitable that calls the LLM
+        :param user_id: User the request is made for (None for background jobs)
+        :param priority: INTERACTIVE or BACKGROUND
+        :return: Result of the call
+        :raises SchedulerBusy: If the request was rejected or waited too long
+        """
+        users = self._queues[priority]
+        user_queued = len(users.get(user_id, ())) if user_id is not None else 0
+        if self._queued[priority] >= self.max_queue or user_queued >= self.max_queued_per_user:
+            self.rejected += 1
+            raise SchedulerBusy('LLM queue is full')
+
+        job = _Job(func=func, user_id=user_id, priority=priority)
+        users.setdefault(user_id, deque()).append(job)
+        self._queued[priority] += 1
+        self._dispatch()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(job.started), timeout=self.max_wait[priority])
+        except asyncio.TimeoutError:
+            if job.task is None:
+                self._remove(job)
+                self.expired += 1
+                raise SchedulerBusy('LLM request waited too long')
+        except asyncio.CancelledError:
+            if job.task is None:
+                self._remove(job)
+            else:
+                job.task.cancel()
+            raise
+
+        try:
+            return await asyncio.shield(job.task)
+        except asyncio.CancelledError:
+            job.task.cancel()
+            raise
+
+    def stats(self) -> Dict:
+        """
+        Returns the queue metrics.
+
+        :return: Dictionary with queue depths, running, completed, rejected and expired requests
+        """
+        return {
+            'queued_interactive': self._queued[INTERACTIVE],
+            'queued_background': self._queued[BACKGROUND],
+            'running': self._running,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'expired': self.expired,
+            'max_wait_seen': self.max_wait_seen,
+        }
+
+    def _next_job(self) -> Optional[_Job]:
+        for priority in (INTERACTIVE, BACKGROUND):
+            users = self._queues[priority]
+            if users:
+                user_id, jobs = next(iter(users.items()))
+                job = jobs.popleft()
+                if jobs:
+                    users.move_to_end(user_id)  # Round-robin between users
+                else:
+                    del users[user_id]
+                self._queued[priority] -= 1
+                return job
+        return None
+
+    def _dispatch(self) -> None:
+        while self._running < self.concurrency:
+            job = self._next_job()
+            if job is None:
+                return
+            self._running += 1
+            self.max_wait_seen = max(self.max_wait_seen, monotonic() - job.enqueued_at)
+            job.task = asyncio.ensure_future(job.func())
+            job.task.add_done_callback(self._on_done)
+            job.started.set_result(None)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._running -= 1
+        self.completed += 1
+        self._dispatch()
+
+    def _remove(self, job: _Job) -> None:
+        users = self._queues[job.priority]
+        jobs = users.get(job.user_id)
+        if jobs is not None and job in jobs:
+            jobs.remove(job)
+            self._queued[job.priority] -= 1
+            if not jobs:
+                del users[job.user_id]
+
+
+# Shared scheduler for all Gaianet calls
+llm_scheduler = LLMScheduler()
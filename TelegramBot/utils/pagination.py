@@ -3,7 +3,7 @@ import asyncio
 from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardButton
 from aiogram.filters.callback_data import CallbackData
 
-from data.async_database import Event
+from data.event_catalog import event_catalog
 
 class Pagination(CallbackData, prefix="pag"):
     action: str
@@ -12,8 +12,7 @@ class Pagination(CallbackData, prefix="pag"):
     tag: str = 'test'
 
 async def paginator(tag: str, page: int = 0):
-    event = Event()
-    count_event = len(await event.get_info_all_events_by_tag(tag=tag))
+    count_event = len(await event_catalog.get_info_all_events_by_tag(tag=tag))
     builder = InlineKeyboardBuilder()
     builder.row(
         InlineKeyboardButton(text='⬅', callback_data=Pagination(action='prev', page=page, tag=tag, count_event=count_event).pack()),
@@ -25,8 +24,7 @@ async def paginator(tag: str, page: int = 0):
 
 async def get_msg_info_events(tag: str, skip: int = 0, limit: int = 5):
     print('get_msg_info_events')
-    event = Event()
-    list_events = await event.get_info_all_events_by_tag(tag=tag)
+    list_events = await event_catalog.get_info_all_events_by_tag(tag=tag)
     # Pagination.count_event = len(list_events)
     # Pagination.tag = tag
     print(list_events)
@@ -0,0 +1,112 @@
+import asyncio
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, Hashable
+
+
+class TokenBucket:
+    """
+    Asynchronous token bucket: allows `rate` operations per second on average with bursts up to `capacity`.
+    `acquire` waits until a token is available, `pause` stops handing out tokens for a while
+    (e.g. after Telegram answers with RetryAfter).
+
+    :param rate: Tokens added per second
+    :param capacity: Maximum number of tokens in the bucket
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated_at = monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        """
+        Waits for a token and takes it.
+        """
+        async with self._lock:
+            while True:
+                now = monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stops handing out tokens for the given number of seconds.
+        """
+        self.paused_until = max(self.paused_until, monotonic() + seconds)
+        self.tokens = 0
+
+
+class SlidingWindowLimiter:
+    """
+    Per-key rate limiter: allows at most `limit` hits per `window` seconds.
+
+    Uses the sliding window counter approximation: for every key only the counts of the current and
+    the previous fixed window are kept, and the previous one is weighted by how much of it still overlaps
+    the sliding window. A check is O(1), old counts expire lazily on the next hit of the key, and the
+    table keeps at most `max_keys` keys, evicting the least recently seen ones.
+
+    :param limit: Hits allowed per window
+    :param window: Window length in seconds
+    :param max_keys: Maximum number of tracked keys
+    """
+
+    def __init__(self, limit: int, window: float, max_keys: int):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._counters: OrderedDict = OrderedDict()  # key -> [window number, current count, previous count]
+        self.allowed = 0
+        self.limited = 0
+        self.evicted = 0
+
+    def hit(self, key: Hashable) -> bool:
+        """
+        Registers a hit of the key.
+
+        :param key: Key to limit (e.g. the user ID)
+        :return: True if the hit is within the limit
+        """
+        now = monotonic()
+        current_window = int(now // self.window)
+
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = [current_window, 0, 0]
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._counters.move_to_end(key)
+            if counter[0] != current_window:
+                counter[2] = counter[1] if counter[0] == current_window - 1 else 0
+                counter[1] = 0
+                counter[0] = current_window
+
+        counter[1] += 1
+        overlap = 1 - (now % self.window) / self.window
+        if counter[2] * overlap + counter[1] > self.limit:
+            self.limited += 1
+            return False
+        self.allowed += 1
+        return True
+
+    def stats(self) -> Dict:
+        """
+        Returns the number of tracked keys and of allowed, limited and evicted hits.
+        """
+        return {'keys': len(self._counters), 'allowed': self.allowed, 'limited': self.limited,
+                'evicted': self.evicted}
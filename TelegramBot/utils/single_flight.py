@@ -0,0 +1,55 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call with some key is in flight, other callers with
+    the same key wait for its result instead of starting their own.
+
+    Every waiter gets the same result or the same exception. A cancelled waiter only stops waiting;
+    the shared call is cancelled when its last waiter is gone.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the result of `func()`, sharing it with concurrent callers that use the same key.
+
+        :param key: Key identifying identical calls
+        :param func: Function returning the awaitable to run if no call with the key is in flight
+        :return: Result of the call
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(func()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every caller gave up waiting
+                self._forget(key, call)
+                call.task.cancel()
+
+    def is_in_flight(self, key: Hashable) -> bool:
+        """
+        Returns whether a call with the key is in flight.
+        """
+        return key in self._calls
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
@@ -0,0 +1,90 @@
+import asyncio
+from contextlib import asynccontextmanager, nullcontext
+from typing import AsyncGenerator, Dict, Hashable, List
+
+from aiogram.fsm.storage.base import BaseEventIsolation, StorageKey
+
+from TelegramBot.settings.config import UPDATE_CONCURRENCY
+from data.async_database import UpdateLocks
+
+
+class UserOrderedIsolation(BaseEventIsolation):
+    """
+    Event isolation that handles the updates of one user one at a time, in the order they arrived,
+    while the updates of different users are handled in parallel, at most `concurrency` at a time.
+
+    The dispatcher handles every update in its own task and takes this lock (keyed by chat and user)
+    before the handlers run. asyncio.Lock wakes its waiters in FIFO order, so the per-user state
+    (FSM state, stored event lists) is never changed by two updates of the same user at once.
+    A user's lock is dropped as soon as none of their updates is running or waiting.
+
+    These locks only order the updates handled by this process. With several webhook workers,
+    `locks` (see use_process_locks) additionally takes a MySQL lock of the user around the update,
+    so two workers do not handle updates of the same user at once.
+
+    :param concurrency: Maximum number of updates handled at the same time
+    """
+
+    def __init__(self, concurrency: int = UPDATE_CONCURRENCY):
+        self.concurrency = concurrency
+        self.locks = None
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._users: Dict[Hashable, List] = {}  # key -> [lock, updates running or waiting]
+        self.running = 0
+        self.handled = 0
+        self.max_pending = 0
+
+    @asynccontextmanager
+    async def lock(self, key: StorageKey) -> AsyncGenerator[None, None]:
+        """
+        Waits for the previous updates of the user and for a free slot.
+
+        :param key: Storage key of the update (bot, chat and user)
+        """
+        user = self._users.get(key)
+        if user is None:
+            user = self._users[key] = [asyncio.Lock(), 0]
+        user[1] += 1
+        self.max_pending = max(self.max_pending, user[1])
+        try:
+            async with user[0], self._semaphore, self._process_lock(key):
+                self.running += 1
+                try:
+                    yield
+                finally:
+                    self.running -= 1
+                    self.handled += 1
+        finally:
+            user[1] -= 1
+            if not user[1]:
+                del self._users[key]  # Reclaim the lock of an idle user
+
+    def use_process_locks(self, timeout: float) -> None:
+        """
+        Also locks each user in MySQL, for the webhook mode where any worker may get the user's next update.
+
+        :param timeout: Seconds to wait for an update of the user handled by another worker
+        """
+        self.locks = UpdateLocks(maxsize=self.concurrency, timeout=timeout)
+
+    def _process_lock(self, key: StorageKey):
+        if self.locks is None:
+            return nullcontext()
+        return self.locks.hold(name=f'upd:{key.bot_id}:{key.chat_id}:{key.user_id}')
+
+    async def close(self) -> None:
+        self._users.clear()
+        if self.locks is not None:
+            await self.locks.close()
+
+    def stats(self) -> Dict:
+        """
+        Returns the number of users with pending updates, the updates running and handled,
+        and the longest queue of one user.
+        """
+        return {'users': len(self._users), 'running': self.running, 'handled': self.handled,
+                'max_pending': self.max_pending, 'lock_timeouts': self.locks.timeouts if self.locks else 0}
+
+
+# Shared isolation passed to the dispatcher
+update_isolation = UserOrderedIsolation()
@@ -0,0 +1,98 @@
+"""
+Compares the FSM storages: MemoryStorage and BatchedFSMStorage.
+
+Every simulated update reads the state, and one update in three sets a state and updates the data,
+like the FindList and FeedBack dialogs do. The batched storage is flushed after every update, as
+FSMFlushMiddleware does. By default the batched storage writes to the MySQL database
+from .env; with --no-db it writes to an in-memory table, which measures the overhead of the storage itself.
+
+    python -m benchmarks.fsm_storage_benchmark --users 1000 --updates 20000
+"""
+import argparse
+import asyncio
+import random
+from time import perf_counter
+
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from TelegramBot.utils.fsm_storage import BatchedFSMStorage
+from TelegramBot.utils.states import FindList
+from data.async_database import close_pool
+
+
+class InMemoryStateTable:
+    """
+    Stand-in for FSMStateDB keeping the rows in a dictionary, used with --no-db.
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.writes = 0
+
+    async def get_fsm_state(self, fsm_key: str):
+        return self.rows.get(fsm_key)
+
+    async def save_fsm_states(self, rows: list):
+        self.writes += 1
+        for fsm_key, state, data in rows:
+            self.rows[fsm_key] = {'state': state, 'data': data}
+
+    async def delete_fsm_states(self, fsm_keys: list):
+        self.writes += 1
+        for (fsm_key,) in fsm_keys:
+            self.rows.pop(fsm_key, None)
+
+    async def delete_stale_fsm_states(self, seconds: int):
+        pass
+
+
+async def run_updates(storage, users: int, updates: int) -> float:
+    """
+    Simulates the updates and returns the elapsed seconds.
+    """
+    rng = random.Random(42)
+    keys = [StorageKey(bot_id=1, chat_id=user_id, user_id=user_id) for user_id in range(users)]
+    started = perf_counter()
+    for number in range(updates):
+        key = rng.choice(keys)
+        state = await storage.get_state(key=key)
+        if number % 3 == 0:
+            if state is None:
+                await storage.set_state(key=key, state=FindList.key)
+                await storage.set_data(key=key, data={'step': number})
+            else:
+                await storage.set_state(key=key, state=None)
+                await storage.set_data(key=key, data={})
+        else:
+            await storage.get_data(key=key)
+        if isinstance(storage, BatchedFSMStorage):
+            await storage.flush(keys=[key])
+    return perf_counter() - started
+
+
+async def main(users: int, updates: int, no_db: bool):
+    memory_seconds = await run_updates(MemoryStorage(), users=users, updates=updates)
+
+    database = InMemoryStateTable() if no_db else None
+    storage = BatchedFSMStorage(database=database)
+    batched_seconds = await run_updates(storage, users=users, updates=updates)
+    if not no_db:
+        await close_pool()
+
+    stats = storage.stats()
+    print(f'Updates: {updates}, users: {users}, database: {"in-memory" if no_db else "MySQL"}')
+    print(f'MemoryStorage:     {memory_seconds * 1e6 / updates:8.2f} us per update')
+    print(f'BatchedFSMStorage: {batched_seconds * 1e6 / updates:8.2f} us per update '
+          f'(+{(batched_seconds - memory_seconds) * 1e6 / updates:.2f} us)')
+    print(f'Buffer hits: {stats["buffer_hits"]}, database reads: {stats["database_reads"]}, '
+          f'states written: {stats["flushed"]}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--updates', type=int, default=20000)
+    parser.add_argument('--no-db', action='store_true', help='Write to an in-memory table instead of MySQL')
+    args = parser.parse_args()
+    asyncio.run(main(users=args.users, updates=args.updates, no_db=args.no_db))
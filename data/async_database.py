@@ -1,11 +1,58 @@
 from typing import List, Union, Dict, AnyStr
+from contextlib import asynccontextmanager
 import json
 from datetime import datetime
 import asyncio
 
 import aiomysql
 
-from TelegramBot.settings.config import DB_LOGIN, DB_PASSWORD, DB_PORT, DB_HOST, DB_NAME
+from TelegramBot.settings.config import DB_LOGIN, DB_PASSWORD, DB_PORT, DB_HOST, DB_NAME, DB_POOL_MINSIZE, \
+    DB_POOL_MAXSIZE, DB_POOL_RECYCLE, DB_POOL_ACQUIRE_TIMEOUT
+from data.user_cache import user_cache
+from data.log_sink import LogSink
+from data.sql_guard import guard_generated_sql, UnsafeQuery
+
+# Process-wide connection pool shared by every AsyncDataBase instance
+_pool = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_pool() -> aiomysql.Pool:
+    """
+    Returns the shared aiomysql pool, creating it on first use.
+
+    All database classes (UserDB, Event, ListEvents, LogsDB, ...) share this single pool,
+    so constructing new instances per call does not open new connections.
+
+    :return: The shared connection pool
+    """
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await aiomysql.create_pool(
+                    host=DB_HOST,
+                    port=int(DB_PORT),
+                    user=DB_LOGIN,
+                    password=DB_PASSWORD,
+                    db=DB_NAME,
+                    minsize=DB_POOL_MINSIZE,
+                    maxsize=DB_POOL_MAXSIZE,
+                    pool_recycle=DB_POOL_RECYCLE,
+                    cursorclass=aiomysql.DictCursor,
+                )
+    return _pool
+
+
+async def close_pool() -> None:
+    """
+    Closes the shared connection pool. Called once on application shutdown.
+    """
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        pool.close()
+        await pool.wait_closed()
 
 
 class AsyncDataBase:
@@ -15,37 +62,70 @@ class AsyncDataBase:
 
     async def init(self):
         if not self.pool:
-            self.pool = await aiomysql.create_pool(
-                host=DB_HOST,
-                port=int(DB_PORT),
-                user=DB_LOGIN,
-                password=DB_PASSWORD,
-                db=DB_NAME,
-                cursorclass=aiomysql.DictCursor,
-            )
+            self.pool = await get_pool()
 
     async def close(self):
-        if self.pool:
-            self.pool.close()
-            await self.pool.wait_closed()
+        # The pool is shared across the process, so an instance only detaches from it.
+        # Use close_pool() on shutdown to actually release the connections.
+        self.pool = None
 
-    async def execute_query_for_gpt(self, query: str):
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Acquires a connection from the shared pool, failing after DB_POOL_ACQUIRE_TIMEOUT seconds
+        instead of waiting forever when the pool is exhausted.
+        """
         await self.init()
-        async with self.pool.acquire() as conn:
+        conn = await asyncio.wait_for(self.pool.acquire(), timeout=DB_POOL_ACQUIRE_TIMEOUT)
+        try:
+            yield conn
+        finally:
+            self.pool.release(conn)
+
+    async def execute_query_for_gpt(self, query: str, user_query: str = None):
+        """
+        Executes an SQL query written by the LLM after checking and bounding it (see guard_generated_sql).
+        Rejected statements are logged to the 'generated_sql_rejections' table for prompt tuning.
+
+        :param query: Generated SQL query
+        :param user_query: User's question the query was generated for
+        :return: Rows with the 'id_event' column
+        :raises UnsafeQuery: If the statement is not allowed
+        """
+        try:
+            query = guard_generated_sql(query)
+        except UnsafeQuery as ex:
+            print(f'Generated SQL rejected ({ex}): {query}')
+            log_sink.put(query="""INSERT INTO generated_sql_rejections (user_query, sql_text, reason)
+                                  VALUES (%s, %s, %s)""", args=(user_query, query, str(ex)))
+            raise
+
+        async with self.acquire() as conn:
             async with conn.cursor() as cursor:
                 await cursor.execute(query)
                 result = await cursor.fetchall()
                 return result
 
     async def execute_query(self, query: str, args: tuple = ()) -> Union[None, List]:
-        await self.init()
-        async with self.pool.acquire() as conn:
+        async with self.acquire() as conn:
             async with conn.cursor() as cursor:
                 await cursor.execute(query, args)
                 await conn.commit()
                 result = await cursor.fetchall()
                 return result
 
+    async def execute_many(self, query: str, args_list: List[tuple]) -> None:
+        """
+        Executes the same query for many sets of arguments in a single round-trip (multi-row INSERT).
+
+        :param query: Query with placeholders
+        :param args_list: List of argument tuples
+        """
+        async with self.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany(query, args_list)
+                await conn.commit()
+
     async def init_tables(self):
         """
         Initializes database tables if they do not exist.
@@ -55,6 +135,11 @@ class AsyncDataBase:
         2. Conference events table - stores details about conference events including URL, name, description, and more.
         3. Logs table - stores logs of bot interactions including user messages, bot responses, and errors.
         4. Feedback table - stores user feedback with timestamp and user information.
+        5. Private and public event lists of users.
+        6. Membership tables - events in each list and favorite lists of each user.
+        7. Broadcast tables - progress of notification broadcasts and users who blocked the bot.
+        8. Event summaries - AI summaries of event descriptions.
+        9. Rejected generated SQL - statements of the LLM that were not allowed to run.
 
         :return: None
         """
@@ -68,7 +153,8 @@ class AsyncDataBase:
                             template INT,  -- Template preference (as an integer)
                             timezone INT,  -- Timezone preference (as an integer)
                             type_image VARCHAR(50),  -- Preferred image type, up to 50 characters
-                            mode_chat VARCHAR(50) DEFAULT 'news'  -- Default chat mode, can be changed
+                            mode_chat VARCHAR(50) DEFAULT 'news',  -- Default chat mode, can be changed
+                            UNIQUE KEY uq_users_tg_id (tg_id)  -- One row per Telegram user (onboarding upserts)
                         )"""
 
         # SQL query to create the 'conference_events' table if it doesn't exist
@@ -108,34 +194,228 @@ class AsyncDataBase:
                                 feedback_text TEXT  -- User feedback text (can be long)
                             )"""
 
+        # SQL queries to create the private and public event lists of users if they don't exist
+        private_lists_table = """CREATE TABLE IF NOT EXISTS `private_list_events` (
+                                    id_list INT PRIMARY KEY AUTO_INCREMENT,  -- Unique list ID
+                                    `key` VARCHAR(20),  -- Key used to share the list
+                                    id_user INT,  -- Owner of the list
+                                    name_list VARCHAR(255),  -- List name
+                                    event_ids TEXT,  -- Legacy comma-separated event IDs (replaced by private_list_items)
+                                    UNIQUE KEY uq_private_list_events_user (id_user)  -- One private list per user
+                                )"""
+        public_lists_table = """CREATE TABLE IF NOT EXISTS `public_list_events` (
+                                    id_list INT PRIMARY KEY AUTO_INCREMENT,  -- Unique list ID
+                                    `key` VARCHAR(20),  -- Key used to share the list
+                                    id_user INT,  -- Owner of the list
+                                    name_list VARCHAR(255),  -- List name
+                                    event_ids TEXT,  -- Legacy comma-separated event IDs (replaced by public_list_items)
+                                    UNIQUE KEY uq_public_list_events_user (id_user)  -- One public list per user
+                                )"""
+
+        # SQL queries to create the membership tables if they don't exist
+        private_list_items_table = """CREATE TABLE IF NOT EXISTS `private_list_items` (
+                                        id_list INT NOT NULL,  -- List ID (private_list_events)
+                                        id_event INT NOT NULL,  -- Event ID (conference_events)
+                                        date_add TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- When the event was saved
+                                        PRIMARY KEY (id_list, id_event),
+                                        KEY idx_private_list_items_event (id_event)  -- Subscribers of an event
+                                    )"""
+        public_list_items_table = """CREATE TABLE IF NOT EXISTS `public_list_items` (
+                                        id_list INT NOT NULL,  -- List ID (public_list_events)
+                                        id_event INT NOT NULL,  -- Event ID (conference_events)
+                                        date_add TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- When the event was saved
+                                        PRIMARY KEY (id_list, id_event),
+                                        KEY idx_public_list_items_event (id_event)
+                                    )"""
+        favorite_lists_table = """CREATE TABLE IF NOT EXISTS `user_favorite_lists` (
+                                    id_user INT NOT NULL,  -- User ID
+                                    id_list INT NOT NULL,  -- Private list ID the user added to favorites
+                                    PRIMARY KEY (id_user, id_list),
+                                    KEY idx_user_favorite_lists_list (id_list)
+                                )"""
+
+        # SQL queries to create the broadcast tables if they don't exist
+        broadcasts_table = """CREATE TABLE IF NOT EXISTS `broadcasts` (
+                                id_broadcast INT PRIMARY KEY AUTO_INCREMENT,  -- Unique broadcast ID
+                                `key` VARCHAR(255) NOT NULL UNIQUE,  -- Key identifying the broadcast (for resuming)
+                                date_start TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- When the broadcast started
+                                date_finish TIMESTAMP NULL  -- When the broadcast finished
+                            )"""
+        broadcast_deliveries_table = """CREATE TABLE IF NOT EXISTS `broadcast_deliveries` (
+                                        id_broadcast INT NOT NULL,  -- Broadcast ID
+                                        tg_id BIGINT NOT NULL,  -- Recipient
+                                        status VARCHAR(20),  -- 'sent', 'blocked' or 'failed'
+                                        PRIMARY KEY (id_broadcast, tg_id)
+                                    )"""
+        blocked_users_table = """CREATE TABLE IF NOT EXISTS `blocked_users` (
+                                    tg_id BIGINT PRIMARY KEY,  -- User who blocked the bot
+                                    date_block TIMESTAMP DEFAULT CURRENT_TIMESTAMP  -- When it was detected
+                                )"""
+
+        # SQL query to create the 'event_summaries' table if it doesn't exist
+        event_summaries_table = """CREATE TABLE IF NOT EXISTS `event_summaries` (
+                                    id_event INT PRIMARY KEY,  -- Event ID (conference_events)
+                                    description_hash CHAR(32) NOT NULL,  -- MD5 of the summarized description
+                                    summary TEXT,  -- AI generated summary
+                                    date_update TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                                )"""
+
+        # SQL query to create the 'generated_sql_rejections' table if it doesn't exist
+        sql_rejections_table = """CREATE TABLE IF NOT EXISTS `generated_sql_rejections` (
+                                    id_rejection INT PRIMARY KEY AUTO_INCREMENT,  -- Unique rejection ID
+                                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- When it was rejected
+                                    user_query TEXT,  -- User's question
+                                    sql_text TEXT,  -- SQL generated by the LLM
+                                    reason VARCHAR(255)  -- Why it was rejected
+                                )"""
+
+        # SQL query to create the 'fsm_states' table if it doesn't exist
+        fsm_states_table = """CREATE TABLE IF NOT EXISTS `fsm_states` (
+                                fsm_key VARCHAR(255) PRIMARY KEY,  -- Bot, chat, user and destiny of the state
+                                state VARCHAR(255),  -- Current FSM state
+                                data TEXT,  -- FSM data as JSON
+                                date_update TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                                INDEX (date_update)
+                            )"""
+
+        # SQL query to create the 'result_sets' table if it doesn't exist (RESULT_STORE_BACKEND = 'mysql')
+        result_sets_table = """CREATE TABLE IF NOT EXISTS `result_sets` (
+                                set_key VARCHAR(64) PRIMARY KEY,  -- Key of the result set or of the user's last token
+                                value MEDIUMTEXT,  -- Stored value as JSON
+                                expires_at TIMESTAMP NOT NULL,  -- Extended on every access
+                                INDEX (expires_at)
+                            )"""
+
+        # SQL query to create the 'processed_updates' table if it doesn't exist (webhook mode)
+        processed_updates_table = """CREATE TABLE IF NOT EXISTS `processed_updates` (
+                                        update_id BIGINT PRIMARY KEY,  -- Telegram update ID
+                                        date_processed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- When it was received
+                                        INDEX (date_processed)
+                                    )"""
+
         # List of queries to be executed for table creation
-        queries = [user_tables, table_conference, logs_table, feedback_table]
+        queries = [user_tables, table_conference, logs_table, feedback_table, private_lists_table, public_lists_table,
+                   private_list_items_table, public_list_items_table, favorite_lists_table, broadcasts_table,
+                   broadcast_deliveries_table, blocked_users_table, event_summaries_table, sql_rejections_table,
+                   processed_updates_table, fsm_states_table, result_sets_table]
 
         # Execute each query asynchronously
         for query in queries:
             await self.execute_query(query=query)
 
+    async def add_unique_indexes(self):
+        """
+        Adds the unique indexes used by the onboarding upserts to tables created before they existed.
+        Duplicate rows are merged first (see merge_duplicate_users and merge_duplicate_lists).
+        Without the indexes the upserts would create more duplicates, so startup fails if one is still missing.
+
+        :raises RuntimeError: If an index could not be added
+        """
+        indexes = (
+            ('users', 'uq_users_tg_id', 'tg_id'),
+            ('private_list_events', 'uq_private_list_events_user', 'id_user'),
+            ('public_list_events', 'uq_public_list_events_user', 'id_user'),
+        )
+        missing = await self._missing_indexes(indexes=indexes)
+        if not missing:
+            return
+
+        if 'uq_users_tg_id' in missing:
+            await self.merge_duplicate_users()
+        for type_list in ('private', 'public'):
+            if f'uq_{type_list}_list_events_user' in missing:
+                await self.merge_duplicate_lists(type_list=type_list)
+
+        for table, index, column in indexes:
+            if index in missing:
+                await self.execute_query(query=f'ALTER TABLE `{table}` ADD UNIQUE KEY {index} ({column})')
+
+        missing = await self._missing_indexes(indexes=indexes)
+        if missing:
+            raise RuntimeError(f'Unique indexes {", ".join(sorted(missing))} are missing')
+
+    async def _missing_indexes(self, indexes: tuple) -> set:
+        query = """SELECT DISTINCT index_name FROM information_schema.statistics
+                   WHERE table_schema = DATABASE() AND index_name IN (%s, %s, %s)"""
+        existing = await self.execute_query(query=query, args=tuple(index for _, index, _ in indexes))
+        existing = {row['index_name'] for row in existing}
+        return {index for _, index, _ in indexes if index not in existing}
+
+    async def _execute_in_transaction(self, queries: List[str]) -> None:
+        async with self.acquire() as conn:
+            try:
+                async with conn.cursor() as cursor:
+                    for query in queries:
+                        await cursor.execute(query)
+                await conn.commit()
+            except Exception:
+                await conn.rollback()
+                raise
+
+    async def merge_duplicate_users(self):
+        """
+        Merges the rows of 'users' with the same tg_id into the oldest one: their lists and favorites
+        are moved to it, then the other rows are deleted. Runs in one transaction.
+        """
+        keep = """(SELECT tg_id, MIN(id_user) AS keep_id FROM users WHERE tg_id IS NOT NULL
+                   GROUP BY tg_id HAVING COUNT(*) > 1)"""
+        queries = [
+            f"""UPDATE {table} t JOIN users u ON u.id_user = t.id_user JOIN {keep} k ON k.tg_id = u.tg_id
+                SET t.id_user = k.keep_id WHERE u.id_user <> k.keep_id"""
+            for table in ('private_list_events', 'public_list_events')
+        ]
+        queries += [
+            f"""UPDATE IGNORE user_favorite_lists t JOIN users u ON u.id_user = t.id_user JOIN {keep} k ON k.tg_id = u.tg_id
+                SET t.id_user = k.keep_id WHERE u.id_user <> k.keep_id""",
+            f"""DELETE t FROM user_favorite_lists t JOIN users u ON u.id_user = t.id_user JOIN {keep} k ON k.tg_id = u.tg_id
+                WHERE u.id_user <> k.keep_id""",
+            f"""DELETE u FROM users u JOIN {keep} k ON k.tg_id = u.tg_id WHERE u.id_user <> k.keep_id""",
+        ]
+        await self._execute_in_transaction(queries=queries)
+
+    async def merge_duplicate_lists(self, type_list: str):
+        """
+        Merges the private or public lists of the same user into the oldest one: the events
+        (and, for private lists, the favorites pointing to them) are moved to it, then the other lists
+        are deleted. Runs in one transaction.
+
+        :param type_list: 'private' or 'public'
+        """
+        lists = f'{type_list}_list_events'
+        items = f'{type_list}_list_items'
+        keep = f"""(SELECT id_user, MIN(id_list) AS keep_id FROM {lists} WHERE id_user IS NOT NULL
+                    GROUP BY id_user HAVING COUNT(*) > 1)"""
+        duplicates = f'JOIN {lists} l ON l.id_list = t.id_list JOIN {keep} k ON k.id_user = l.id_user'
+        queries = [
+            f'UPDATE IGNORE {items} t {duplicates} SET t.id_list = k.keep_id WHERE l.id_list <> k.keep_id',
+            f'DELETE t FROM {items} t {duplicates} WHERE l.id_list <> k.keep_id',
+        ]
+        if type_list == 'private':
+            queries += [
+                f'UPDATE IGNORE user_favorite_lists t {duplicates} SET t.id_list = k.keep_id WHERE l.id_list <> k.keep_id',
+                f'DELETE t FROM user_favorite_lists t {duplicates} WHERE l.id_list <> k.keep_id',
+            ]
+        queries.append(f'DELETE l FROM {lists} l JOIN {keep} k ON k.id_user = l.id_user WHERE l.id_list <> k.keep_id')
+        await self._execute_in_transaction(queries=queries)
+
     async def log_message(self, user_id: int, username: str, message_text: str, response_text: str, error_message: str):
         query = """INSERT INTO logs (user_id, username, message_text, response_text, error_message)
                    VALUES (%s, %s, %s, %s, %s)"""
-        try:
-            await self.execute_query(query=query, args=(user_id, username, message_text, response_text, error_message))
-        except:
-            return
+        log_sink.put(query=query, args=(user_id, username, message_text, response_text, error_message))
 
     async def log_news(self, action: str, response: str, error: str, execution_time: str):
         query = """INSERT INTO logs_news (action, response, error, execution_time)
                          VALUES (%s, %s, %s, %s)"""
         args = (action, response, error, execution_time)
 
-        await self.execute_query(query=query, args=args)
+        log_sink.put(query=query, args=args)
 
     async def log_news_sletter(self, id_news: int, id_tg_user: int, status: str):
         query = """INSERT INTO logs_news_sletter (id_news, id_tg_user, status)
                     values (%s, %s, %s)"""
         args = (id_news, id_tg_user, status)
 
-        await self.execute_query(query=query, args=args)
+        log_sink.put(query=query, args=args)
 
     async def get_promt(self):
         query = "select text_promt from promt where name_promt = 'main_promt'"
@@ -172,25 +452,105 @@ class UserDB(AsyncDataBase):
         :return: User information
         """
         query = "select * from `users` where tg_id = %s"
-        return await self.execute_query(query=query, args=(tg_id,))
+        result = await self.execute_query(query=query, args=(tg_id,))
+        if result:
+            user_cache.set(tg_id, result[0])
+        else:
+            user_cache.set_missing(tg_id)
+        return result
+
+    async def get_cached_user_info(self, tg_id: int) -> Union[None, Dict]:
+        """
+        Retrieves the user's profile from the in-process cache, falling back to the database on a miss.
+
+        :param tg_id: Telegram user ID
+        :return: User profile or None if the user does not exist
+        """
+        cached, profile = user_cache.lookup(tg_id)
+        if not cached:
+            result = await self.get_user_info(tg_id=tg_id)
+            profile = result[0] if result else None
+        return profile
 
-    async def insert_new_user(self, tg_id: int, tg_username: str) -> None:
+    async def get_user_mode(self, tg_id: int) -> Union[None, str]:
         """
-        Inserts a new user into the 'users' table if they don't already exist.
+        Retrieves the user's chat mode, served from the cache on the hot path.
+
+        :param tg_id: Telegram user ID
+        :return: The user's chat mode or None if the user does not exist
+        """
+        profile = await self.get_cached_user_info(tg_id=tg_id)
+        return profile['mode_chat'] if profile else None
+
+    async def onboard_user(self, tg_id: int, tg_username: str) -> None:
+        """
+        Creates the user with their private and public lists, or updates the username of an existing user.
+        Idempotent: the rows are upserted (unique indexes on users.tg_id and on the owner of each list)
+        in one transaction on one connection, without reading anything first.
 
         :param tg_id: Telegram user ID
         :param tg_username: Telegram username
         """
-        # Check if the user already exists
-        check_query = "SELECT COUNT(*) FROM `users` WHERE tg_id = %s"
-        insert_query = "INSERT INTO `users` (tg_username, tg_id) VALUES (%s, %s)"
+        username = tg_username if tg_username is not None else 'None'
+        key = f'{str(tg_id)[5:]}'  # Key used to share the lists, based on the Telegram user ID
+
+        async with self.acquire() as conn:
+            try:
+                async with conn.cursor() as cursor:
+                    # LAST_INSERT_ID(id_user) makes lastrowid the ID of the existing row as well
+                    await cursor.execute("""INSERT INTO `users` (tg_username, tg_id) VALUES (%s, %s)
+                                            ON DUPLICATE KEY UPDATE tg_username = VALUES(tg_username),
+                                                                    id_user = LAST_INSERT_ID(id_user)""",
+                                         (tg_username, tg_id))
+                    id_user = cursor.lastrowid
+                    await cursor.execute("""INSERT INTO private_list_events (`key`, id_user, name_list)
+                                            VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE id_user = id_user""",
+                                         (key, id_user, f'Priv_{username}'))
+                    await cursor.execute("""INSERT INTO public_list_events (`key`, id_user, name_list)
+                                            VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE id_user = id_user""",
+                                         (key, id_user, f'Pub_{username}'))
+                    # A user who starts the bot again is no longer blocked for broadcasts
+                    await cursor.execute('DELETE FROM `blocked_users` WHERE tg_id = %s', (tg_id,))
+                await conn.commit()
+            except Exception:
+                await conn.rollback()
+                raise
 
-        # Fetch the count of users with the provided Telegram ID
-        (count,) = await self.execute_query(check_query, (tg_id,))
+        # Drop the cached profile (or the 'missing' entry of a new user), it is read again on the next update
+        user_cache.invalidate(tg_id)
 
-        # Insert the new user only if they don't already exist
-        if count['COUNT(*)'] == 0:
-            await self.execute_query(insert_query, (tg_username, tg_id))
+    async def set_mode_user(self, tg_id_user: int, mode_chat: str):
+        """
+        Updates the chat mode for a user.
+
+        :param tg_id_user: Telegram user ID
+        :param mode_chat: The new chat mode
+        """
+        query = "update `users` set mode_chat = %s where tg_id = %s"
+        args = (mode_chat, tg_id_user)
+        await self.execute_query(query=query, args=args)
+        user_cache.update(tg_id_user, mode_chat=mode_chat)
+
+    async def get_active_tg_ids(self) -> List[int]:
+        """
+        Retrieves the Telegram IDs of all users who have not blocked the bot.
+
+        :return: List of Telegram IDs
+        """
+        query = """SELECT u.tg_id FROM users u
+                   LEFT JOIN blocked_users b ON b.tg_id = u.tg_id
+                   WHERE b.tg_id IS NULL"""
+        result = await self.execute_query(query=query)
+        return [int(user['tg_id']) for user in result]
+
+    async def block_users(self, tg_ids: List[int]) -> None:
+        """
+        Marks users who blocked the bot, so that broadcasts skip them.
+
+        :param tg_ids: Telegram IDs
+        """
+        query = 'INSERT IGNORE INTO blocked_users (tg_id) VALUES (%s)'
+        await self.execute_many(query=query, args_list=[(tg_id,) for tg_id in tg_ids])
 
     async def select_all_users(self) -> List[Dict]:
         """
@@ -216,17 +576,6 @@ class UserDB(AsyncDataBase):
     #     args = (data['list_topics'], data['template'], data['timezone'], data['type_img'], tg_id)
     #     await self.execute_query(query=query, args=args)
 
-    # async def set_mode_user(self, tg_id_user: int, mode_chat: str):
-    #     """
-    #     Updates the chat mode for a user.
-    #
-    #     :param tg_id_user: Telegram user ID
-    #     :param mode_chat: The new chat mode
-    #     """
-    #     query = "update `users` set mode_chat = %s where tg_id = %s"
-    #     args = (mode_chat, tg_id_user)
-    #     await self.execute_query(query=query, args=args)
-
     # async def edit_topics(self, list_topics: list, tg_id: int):
     #     """
     #     Updates the topics for a user.
@@ -269,10 +618,8 @@ class UserDB(AsyncDataBase):
         :param id_user: User ID
         :param list_id: The list ID to be added
         """
-        query = """UPDATE users
-                   SET favorites_private_lists = CONCAT(favorites_private_lists, %s)
-                   where id_user = %s"""
-        args = (f",{list_id}", id_user)
+        query = 'INSERT IGNORE INTO user_favorite_lists (id_user, id_list) VALUES (%s, %s)'
+        args = (id_user, list_id)
         await self.execute_query(query=query, args=args)
 
     async def delete_favorit_private_lists(self, id_user: int, list_id: int):
@@ -282,23 +629,37 @@ class UserDB(AsyncDataBase):
         :param id_user: User ID
         :param list_id: The list ID to be removed
         """
-        query = """UPDATE users
-                   SET favorites_private_lists = TRIM(BOTH ',' FROM REPLACE(CONCAT(',', TRIM(BOTH ',' FROM favorites_private_lists), ','), CONCAT(',', %s, ','), ','))
-                   WHERE id_user = %s"""
-        args = (list_id, id_user)
+        query = 'DELETE FROM user_favorite_lists WHERE id_user = %s AND id_list = %s'
+        args = (id_user, list_id)
         await self.execute_query(query=query, args=args)
 
     async def get_favorite_private_list_by_user_id(self, id_user: int):
         """
-        Retrieves the favorite private lists for a user by their Telegram ID.
+        Retrieves the IDs of the favorite private lists for a user by their Telegram ID.
 
-        :param id_user: User ID
-        :return: The user's favorite private lists
+        :param id_user: Telegram user ID
+        :return: List of list IDs
         """
-        query = 'select favorites_private_lists from users where tg_id = %s'
+        query = """SELECT f.id_list FROM user_favorite_lists f
+                   JOIN users u ON u.id_user = f.id_user
+                   WHERE u.tg_id = %s"""
         args = (id_user,)
         result = await self.execute_query(query=query, args=args)
-        return result
+        return [row['id_list'] for row in result]
+
+    async def is_favorite_private_list(self, tg_id: int, list_id: int) -> bool:
+        """
+        Checks whether a list is among the user's favorite private lists.
+
+        :param tg_id: Telegram user ID
+        :param list_id: List ID
+        :return: True if the list is a favorite of the user
+        """
+        query = """SELECT EXISTS(SELECT 1 FROM user_favorite_lists f
+                                 JOIN users u ON u.id_user = f.id_user
+                                 WHERE u.tg_id = %s AND f.id_list = %s) AS is_favorite"""
+        result = await self.execute_query(query=query, args=(tg_id, list_id))
+        return bool(result[0]['is_favorite'])
 
 
 # class NewDB(AsyncDataBase):
@@ -489,19 +850,39 @@ class AdminDB(AsyncDataBase):
         return int(average_requests)  # Return the average as an integer
 
 
+# Column sets (projections) of the 'conference_events' table.
+# The LONGTEXT columns agenda and html_event are only read on demand with Event.get_event_fields.
+EVENT_CARD_COLUMNS = ('id_event', 'name_event', 'date_event', 'time_event', 'location_event', 'host_event',
+                      'url_event')
+EVENT_DETAIL_COLUMNS = EVENT_CARD_COLUMNS + ('speakers_event', 'tags_event', 'sponsors', 'urls_in_event',
+                                             'description_event')
+
+
+def projection(columns: tuple) -> str:
+    """
+    Builds the column list of a SELECT from a projection.
+
+    :param columns: Tuple of column names
+    :return: Comma-separated column list
+    """
+    return ', '.join(columns)
+
+
 class Event(AsyncDataBase):
     """
     This class handles database operations related to conference events. It includes methods
     to retrieve, update, and search for events by different criteria such as tags, location, and date.
+    List and search methods return the card projection, single-event methods the detail projection.
     """
 
-    async def get_all_events(self):
+    async def get_all_events(self, columns: tuple = EVENT_CARD_COLUMNS):
         """
         Retrieves all events from the 'conference_events' table.
 
+        :param columns: Columns to select (card projection by default)
         :return: List of all events
         """
-        query = 'select * from conference_events'
+        query = f'select {projection(columns)} from conference_events'
         result = await self.execute_query(query=query)
         return result
 
@@ -551,31 +932,44 @@ class Event(AsyncDataBase):
         args = (f"%{tag}%", '%EthCC Main Event:%')
         return await self.execute_query(query=query, args=args)
 
-    async def get_info_many_events(self, list_ids_events: list):
+    async def get_info_many_events(self, list_ids_events: list, columns: tuple = EVENT_CARD_COLUMNS):
         """
-        Retrieves detailed information for multiple events based on their IDs.
+        Retrieves information for multiple events based on their IDs.
 
         :param list_ids_events: List of event IDs
-        :return: List of events with detailed information
+        :param columns: Columns to select (card projection by default)
+        :return: List of events
         """
-        query = 'select * from conference_events where id_event in %s'
+        query = f'select {projection(columns)} from conference_events where id_event in %s'
         args = (set(list_ids_events),)
         result = await self.execute_query(query=query, args=args)
         return result
 
-    async def get_info_event_by_id(self, id_event: int):
+    async def get_info_event_by_id(self, id_event: int, columns: tuple = EVENT_DETAIL_COLUMNS):
         """
         Retrieves detailed information for a specific event based on its ID.
 
         :param id_event: Event ID
+        :param columns: Columns to select (detail projection by default)
         :return: Event details
         """
-        query = 'select * from conference_events where id_event = %s'
+        query = f'select {projection(columns)} from conference_events where id_event = %s'
         args = (id_event,)
         result = await self.execute_query(query=query, args=args)
-        print('result', result)  # For debugging purposes
         return result[0]
 
+    async def get_event_fields(self, id_event: int, columns: tuple):
+        """
+        Retrieves only the given columns of an event, e.g. the heavy 'agenda' or 'html_event' when they are needed.
+
+        :param id_event: Event ID
+        :param columns: Columns to select
+        :return: Dictionary with the requested columns or None if the event does not exist
+        """
+        query = f'select {projection(columns)} from conference_events where id_event = %s'
+        result = await self.execute_query(query=query, args=(id_event,))
+        return result[0] if result else None
+
     async def find_events_by_tag(self, tags: list):
         """
         Finds events that match any of the provided tags.
@@ -587,10 +981,10 @@ class Event(AsyncDataBase):
         :return: List of events that match the tags
         """
         if 'AI' in tags:
-            query = "SELECT * FROM conference_events WHERE tags_event LIKE %s"
+            query = f"SELECT {projection(EVENT_CARD_COLUMNS)} FROM conference_events WHERE tags_event LIKE %s"
             params = ("%, AI%",)
         else:
-            query = 'select * from conference_events where '
+            query = f'select {projection(EVENT_CARD_COLUMNS)} from conference_events where '
             query += " or ".join(["tags_event like %s" for _ in tags])
             params = [f"%{tag}%" if tag != 'Sport' else tag for tag in tags]
 
@@ -605,7 +999,7 @@ class Event(AsyncDataBase):
         :param location: Location to search for
         :return: List of events in the specified location
         """
-        query = "select * from conference_events where name_event like %s and location_event like %s"
+        query = f"select {projection(EVENT_CARD_COLUMNS)} from conference_events where name_event like %s and location_event like %s"
         args = ("%[IMPACT]%", f"%{location}%")
         result = await self.execute_query(query=query, args=args)
         return result
@@ -617,7 +1011,7 @@ class Event(AsyncDataBase):
         :param day: Day to search for (formatted as a string)
         :return: List of events on the specified day
         """
-        query = "select * from conference_events where name_event like %s and date_event like %s"
+        query = f"select {projection(EVENT_CARD_COLUMNS)} from conference_events where name_event like %s and date_event like %s"
         args = ("%[IMPACT]%", f"%{day}%")
         result = await self.execute_query(query=query, args=args)
         return result
@@ -630,7 +1024,7 @@ class Event(AsyncDataBase):
         :param day: Day to search for
         :return: List of events that match both location and day
         """
-        query = "select * from conference_events where name_event like %s and date_event like %s and location_event like %s"
+        query = f"select {projection(EVENT_CARD_COLUMNS)} from conference_events where name_event like %s and date_event like %s and location_event like %s"
         args = ("%[IMPACT]%", f"%{day}%", f"%{location}%")
         result = await self.execute_query(query=query, args=args)
         return result
@@ -639,6 +1033,7 @@ class Event(AsyncDataBase):
 class LogsDB(AsyncDataBase):
     """
     This class handles logging operations for the bot. It logs user messages, bot responses, and errors into the 'logs' table.
+    Rows are queued to the background log sink and written in batches.
     """
 
     async def log_message(self, user_id: int, username: str, message_text: str, response_text: str, error_message: str):
@@ -653,12 +1048,346 @@ class LogsDB(AsyncDataBase):
         """
         query = """INSERT INTO logs (user_id, username, message_text, response_text, error_message)
                    VALUES (%s, %s, %s, %s, %s)"""
+        # The row is written in the background by the log sink, so logging never delays the reply
+        log_sink.put(query=query, args=(user_id, username, message_text, response_text, error_message))
+
+
+class BroadcastDB(AsyncDataBase):
+    """
+    This class stores the progress of broadcasts, so that an interrupted broadcast can be resumed
+    without sending the message twice.
+    """
+
+    async def start_broadcast(self, key: str):
+        """
+        Creates the broadcast with the given key or returns the existing one.
+
+        :param key: Unique key of the broadcast
+        :return: Tuple of the broadcast ID and whether it has already finished
+        """
+        await self.execute_query(query='INSERT IGNORE INTO broadcasts (`key`) VALUES (%s)', args=(key,))
+        result = await self.execute_query(query='select id_broadcast, date_finish from broadcasts where `key` = %s',
+                                          args=(key,))
+        return result[0]['id_broadcast'], result[0]['date_finish'] is not None
+
+    async def get_delivered(self, id_broadcast: int):
+        """
+        Retrieves the recipients the broadcast has already been sent to.
+
+        :param id_broadcast: Broadcast ID
+        :return: Set of Telegram IDs
+        """
+        query = 'select tg_id from broadcast_deliveries where id_broadcast = %s'
+        result = await self.execute_query(query=query, args=(id_broadcast,))
+        return {int(row['tg_id']) for row in result}
+
+    async def save_deliveries(self, rows: List[tuple]):
+        """
+        Stores the delivery status of recipients.
+
+        :param rows: Tuples of (id_broadcast, tg_id, status)
+        """
+        query = 'INSERT IGNORE INTO broadcast_deliveries (id_broadcast, tg_id, status) VALUES (%s, %s, %s)'
+        await self.execute_many(query=query, args_list=rows)
+
+    async def finish_broadcast(self, id_broadcast: int):
+        """
+        Marks the broadcast as finished.
+
+        :param id_broadcast: Broadcast ID
+        """
+        query = 'update broadcasts set date_finish = NOW() where id_broadcast = %s'
+        await self.execute_query(query=query, args=(id_broadcast,))
+
+
+class SummaryDB(AsyncDataBase):
+    """
+    This class stores the AI summaries of event descriptions together with the hash of the summarized
+    description, so a summary is generated again only when the description changes.
+    """
+
+    async def get_summary(self, id_event: int):
+        """
+        Retrieves the stored summary of an event.
+
+        :param id_event: Event ID
+        :return: Dictionary with 'description_hash' and 'summary', or None
+        """
+        query = 'select description_hash, summary from event_summaries where id_event = %s'
+        result = await self.execute_query(query=query, args=(id_event,))
+        return result[0] if result else None
+
+    async def get_summary_hashes(self):
+        """
+        Retrieves the description hashes of all stored summaries.
+
+        :return: Dictionary where key is the event ID and value is the description hash
+        """
+        result = await self.execute_query(query='select id_event, description_hash from event_summaries')
+        return {row['id_event']: row['description_hash'] for row in result}
+
+    async def save_summary(self, id_event: int, description_hash: str, summary: str):
+        """
+        Stores the summary of an event, replacing the previous one.
+
+        :param id_event: Event ID
+        :param description_hash: Hash of the summarized description
+        :param summary: AI generated summary
+        """
+        query = """INSERT INTO event_summaries (id_event, description_hash, summary) VALUES (%s, %s, %s)
+                   ON DUPLICATE KEY UPDATE description_hash = VALUES(description_hash), summary = VALUES(summary)"""
+        await self.execute_query(query=query, args=(id_event, description_hash, summary))
+
+
+class UpdatesDB(AsyncDataBase):
+    """
+    This class records the updates received through the webhook, so an update retried by Telegram
+    is handled only once even if the retry reaches another worker.
+    """
+
+    async def mark_update_processed(self, update_id: int) -> bool:
+        """
+        Records the update.
+
+        :param update_id: Telegram update ID
+        :return: True if the update was not recorded before
+        """
+        async with self.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute('INSERT IGNORE INTO processed_updates (update_id) VALUES (%s)', (update_id,))
+                await conn.commit()
+                return cursor.rowcount == 1
+
+    async def delete_old_updates(self, seconds: int):
+        """
+        Deletes the updates recorded more than `seconds` ago (Telegram stops retrying after a day).
+
+        :param seconds: Age of the records to delete
+        """
+        query = 'delete from processed_updates where date_processed < NOW() - INTERVAL %s SECOND'
+        await self.execute_query(query=query, args=(seconds,))
+
+
+class FSMStateDB(AsyncDataBase):
+    """
+    This class stores the FSM states and data of the users (see BatchedFSMStorage).
+    """
+
+    async def get_fsm_state(self, fsm_key: str):
+        """
+        Retrieves a stored state.
+
+        :param fsm_key: Key of the state
+        :return: Dictionary with 'state' and 'data' (JSON), or None
+        """
+        result = await self.execute_query(query='select state, data from fsm_states where fsm_key = %s',
+                                          args=(fsm_key,))
+        return result[0] if result else None
+
+    async def save_fsm_states(self, rows: List[tuple]):
+        """
+        Stores states, replacing the previous ones.
+
+        :param rows: Tuples of (fsm_key, state, data as JSON)
+        """
+        query = """INSERT INTO fsm_states (fsm_key, state, data) VALUES (%s, %s, %s)
+                   ON DUPLICATE KEY UPDATE state = VALUES(state), data = VALUES(data)"""
+        await self.execute_many(query=query, args_list=rows)
+
+    async def delete_fsm_states(self, fsm_keys: List[tuple]):
+        """
+        Deletes states.
+
+        :param fsm_keys: Tuples of (fsm_key,)
+        """
+        await self.execute_many(query='delete from fsm_states where fsm_key = %s', args_list=fsm_keys)
+
+    async def delete_stale_fsm_states(self, seconds: int):
+        """
+        Deletes the states not changed for `seconds`.
+
+        :param seconds: Age of the states to delete
+        """
+        query = 'delete from fsm_states where date_update < NOW() - INTERVAL %s SECOND'
+        await self.execute_query(query=query, args=(seconds,))
+
+
+class ResultSetDB(AsyncDataBase):
+    """
+    This class stores the event lists users page through (see MySQLResultStoreBackend).
+    """
+
+    async def get_result_set(self, set_key: str, ttl: int):
+        """
+        Retrieves a stored value that has not expired and extends its lifetime.
+
+        :param set_key: Key of the value
+        :param ttl: Seconds the value is kept after this access
+        :return: Value as JSON, or None
+        """
+        query = 'select value from result_sets where set_key = %s and expires_at >= NOW()'
+        result = await self.execute_query(query=query, args=(set_key,))
+        if not result:
+            return None
+        query = 'update result_sets set expires_at = NOW() + INTERVAL %s SECOND where set_key = %s'
+        await self.execute_query(query=query, args=(ttl, set_key))
+        return result[0]['value']
+
+    async def save_result_set(self, set_key: str, value: str, ttl: int):
+        """
+        Stores a value, replacing the previous one.
+
+        :param set_key: Key of the value
+        :param value: Value as JSON
+        :param ttl: Seconds the value is kept
+        """
+        query = """INSERT INTO result_sets (set_key, value, expires_at) VALUES (%s, %s, NOW() + INTERVAL %s SECOND)
+                   ON DUPLICATE KEY UPDATE value = VALUES(value), expires_at = VALUES(expires_at)"""
+        await self.execute_query(query=query, args=(set_key, value, ttl))
+
+    async def delete_result_set(self, set_key: str):
+        """
+        Deletes a stored value.
+
+        :param set_key: Key of the value
+        """
+        await self.execute_query(query='delete from result_sets where set_key = %s', args=(set_key,))
+
+    async def delete_expired_result_sets(self):
+        """
+        Deletes the expired values.
+        """
+        await self.execute_query(query='delete from result_sets where expires_at < NOW()')
+
+
+class LeaderLock(AsyncDataBase):
+    """
+    Named MySQL lock (GET_LOCK) held on a dedicated connection. Only one process of the deployment can hold it,
+    so it elects the process that runs the background jobs. The lock is released by the server
+    when the connection of its holder is lost.
+
+    :param name: Name of the lock
+    """
+
+    def __init__(self, name: str):
+        super().__init__()
+        self.name = name
+        self._conn = None
+
+    async def try_acquire(self) -> bool:
+        """
+        Takes the lock if no other process holds it.
+
+        :return: True if this process holds the lock
+        """
+        if self._conn is not None:
+            return await self.is_held()
+
+        await self.init()
+        conn = await asyncio.wait_for(self.pool.acquire(), timeout=DB_POOL_ACQUIRE_TIMEOUT)
         try:
-            # Executes the query asynchronously with the provided arguments
-            await self.execute_query(query=query, args=(user_id, username, message_text, response_text, error_message))
-        except:
-            # If any error occurs during the logging process, it is silently handled
+            async with conn.cursor() as cursor:
+                await cursor.execute('SELECT GET_LOCK(%s, 0) AS locked', (self.name,))
+                locked = (await cursor.fetchone())['locked'] == 1
+        except Exception:
+            self.pool.release(conn)
+            raise
+        if not locked:
+            self.pool.release(conn)
+            return False
+        self._conn = conn
+        return True
+
+    async def is_held(self) -> bool:
+        """
+        Checks that the lock is still held by this process (the connection may have been lost).
+
+        :return: True if this process holds the lock
+        """
+        if self._conn is None:
+            return False
+        try:
+            async with self._conn.cursor() as cursor:
+                await cursor.execute('SELECT IS_USED_LOCK(%s) = CONNECTION_ID() AS held', (self.name,))
+                if (await cursor.fetchone())['held'] == 1:
+                    return True
+        except Exception as ex:
+            print(f'Leader lock check failed: {ex}')
+        await self.release()
+        return False
+
+    async def release(self) -> None:
+        """
+        Releases the lock and returns the connection to the pool.
+        """
+        conn, self._conn = self._conn, None
+        if conn is None:
             return
+        try:
+            async with conn.cursor() as cursor:
+                await cursor.execute('SELECT RELEASE_LOCK(%s)', (self.name,))
+        except Exception:
+            conn.close()  # The server releases the lock with the connection
+        self.pool.release(conn)
+
+
+class UpdateLocks:
+    """
+    Named MySQL locks (GET_LOCK) that serialize the updates of one user across the webhook workers.
+    A lock is held on a connection of a pool of its own, sized to the number of updates handled at once,
+    so holding it never takes a connection the handlers need.
+
+    :param maxsize: Maximum number of locks held at the same time
+    :param timeout: Seconds to wait for a lock held by another worker
+    """
+
+    def __init__(self, maxsize: int, timeout: float):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.pool = None
+        self.timeouts = 0
+
+    async def _get_pool(self) -> aiomysql.Pool:
+        if self.pool is None:
+            self.pool = await aiomysql.create_pool(host=DB_HOST, port=int(DB_PORT), user=DB_LOGIN,
+                                                   password=DB_PASSWORD, db=DB_NAME, minsize=0,
+                                                   maxsize=self.maxsize, pool_recycle=DB_POOL_RECYCLE,
+                                                   cursorclass=aiomysql.DictCursor)
+        return self.pool
+
+    @asynccontextmanager
+    async def hold(self, name: str):
+        """
+        Holds the lock while the block runs. If another worker keeps it longer than `timeout` seconds
+        the block runs anyway, so a stuck worker does not stop the user's updates.
+
+        :param name: Name of the lock (at most 64 characters)
+        """
+        pool = await self._get_pool()
+        conn = await asyncio.wait_for(pool.acquire(), timeout=DB_POOL_ACQUIRE_TIMEOUT)
+        try:
+            async with conn.cursor() as cursor:
+                await cursor.execute('SELECT GET_LOCK(%s, %s) AS locked', (name, self.timeout))
+                if (await cursor.fetchone())['locked'] != 1:
+                    self.timeouts += 1
+                    print(f'Update lock {name} not acquired in {self.timeout} s')
+            yield
+        finally:
+            try:
+                async with conn.cursor() as cursor:
+                    await cursor.execute('SELECT RELEASE_LOCK(%s)', (name,))
+            except Exception:
+                conn.close()  # The server releases the lock with the connection
+            pool.release(conn)
+
+    async def close(self) -> None:
+        """
+        Closes the connections of the locks.
+        """
+        pool, self.pool = self.pool, None
+        if pool is not None:
+            pool.close()
+            await pool.wait_closed()
 
 
 class FeedbackDB(AsyncDataBase):
@@ -695,7 +1424,7 @@ class ParsingDB(AsyncDataBase):
         :param hours: The number of hours to look back for recently added events
         :return: List of events added in the specified time range
         """
-        query = f"""SELECT *
+        query = f"""SELECT {projection(EVENT_CARD_COLUMNS)}
                     FROM conference_events
                     WHERE date_add >= NOW() - INTERVAL {hours} HOUR;
                  """
@@ -720,74 +1449,18 @@ class ParsingDB(AsyncDataBase):
         :param hours: The number of hours to look back for recently updated events
         :return: List of updated events in the specified time range
         """
-        query = 'select * from conference_events where type_update like %s and date_update >= NOW() - INTERVAL %s HOUR'
+        query = f'select {projection(EVENT_CARD_COLUMNS)} from conference_events where type_update like %s and date_update >= NOW() - INTERVAL %s HOUR'
         result = await self.execute_query(query=query, args=("%update%", hours,))
         return result
 
 
 class ListEvents(AsyncDataBase):
     """
-    This class handles the creation, management, and retrieval of both private and public event lists for users.
-    It includes methods to create lists, add or remove events from lists, and retrieve lists by user or secret key.
+    This class handles the management and retrieval of both private and public event lists for users
+    (the lists are created by UserDB.onboard_user). It includes methods to add or remove events from lists,
+    and retrieve lists by user or secret key.
     """
 
-    # Methods related to creating lists
-    async def create_private_list(self, tg_user: int, username: str):
-        """
-        Creates a private event list for the user. The list is associated with the user's ID and a unique key.
-
-        :param tg_user: Telegram user ID
-        :param username: Username of the user (default to 'None' if username is not provided)
-        """
-        if username is None:
-            username = 'None'
-        id_user_in_db = await self.get_id_by_tg_id(tg_id=tg_user)
-        id_user_in_db = id_user_in_db['id_user']
-        query = 'insert into private_list_events (`key`, id_user, name_list) values (%s, %s, %s)'
-        key = f'{str(tg_user)[5:]}'  # Generate a key based on the Telegram user ID
-        args = (key, id_user_in_db, f"Priv_{username}")
-        await self.execute_query(query=query, args=args)
-
-    async def create_public_list(self, tg_user: int, username: str):
-        """
-        Creates a public event list for the user. The list is associated with the user's ID and a unique key.
-
-        :param tg_user: Telegram user ID
-        :param username: Username of the user (default to 'None' if username is not provided)
-        """
-        if username is None:
-            username = 'None'
-        id_user_in_db = await self.get_id_by_tg_id(tg_id=tg_user)
-        id_user_in_db = id_user_in_db['id_user']
-        query = 'insert into public_list_events (`key`, id_user, name_list) values (%s, %s, %s)'
-        key = f'{str(tg_user)[5:]}'  # Generate a key based on the Telegram user ID
-        args = (key, id_user_in_db, f"Pub_{username}")
-        await self.execute_query(query=query, args=args)
-
-    async def check_private_list_user_and_create_if_none(self, tg_id_user: int, username: str):
-        """
-        Checks if the user has a private event list. If not, creates one.
-
-        :param tg_id_user: Telegram user ID
-        :param username: Username of the user
-        """
-        id_user_in_db = await self.get_id_by_tg_id(tg_id=tg_id_user)
-        id_user_in_db = id_user_in_db['id_user']
-
-        # Check if the user already has a private list
-        result = await self.execute_query(query=f'select * from private_list_events where id_user = {id_user_in_db}')
-        if result:
-            print('Already created list')
-        else:
-            await self.create_private_list(tg_user=tg_id_user, username=username)
-
-        # Check if the user already has a public list
-        result = await self.execute_query(query=f'select * from public_list_events where id_user = {id_user_in_db}')
-        if result:
-            print('Already created list')
-        else:
-            await self.create_public_list(tg_user=tg_id_user, username=username)
-
     async def get_lists_user_by_tg_id(self, tg_id: int):
         """
         Retrieves both public and private event lists for a user by their Telegram ID.
@@ -805,58 +1478,61 @@ class ListEvents(AsyncDataBase):
     # Methods for adding and removing events from lists
     async def add_event_in_private_list(self, id_event: int, id_list: int):
         """
-        Adds an event to a user's private list by concatenating event IDs.
+        Adds an event to a user's private list. Adding an event twice has no effect.
 
         :param id_event: Event ID to be added
         :param id_list: List ID where the event should be added
         """
-        query = """UPDATE private_list_events
-                   SET event_ids = CONCAT(event_ids, %s)
-                   where id_list = %s"""
-        args = (f",{id_event}", id_list)
-        print(query)  # For debugging purposes
-        print(args)  # For debugging purposes
+        query = 'INSERT IGNORE INTO private_list_items (id_list, id_event) VALUES (%s, %s)'
+        args = (id_list, id_event)
         await self.execute_query(query=query, args=args)
 
     async def add_event_in_public_list(self, id_event: int, id_list: int):
         """
-        Adds an event to a user's public list by concatenating event IDs.
+        Adds an event to a user's public list. Adding an event twice has no effect.
 
         :param id_event: Event ID to be added
         :param id_list: List ID where the event should be added
         """
-        query = """UPDATE public_list_events
-                   SET event_ids = CONCAT(event_ids, %s)
-                   where id_list = %s"""
-        args = (f",{id_event}", id_list)
+        query = 'INSERT IGNORE INTO public_list_items (id_list, id_event) VALUES (%s, %s)'
+        args = (id_list, id_event)
         await self.execute_query(query=query, args=args)
 
     async def remove_event_from_public_list(self, id_event: int, id_list: int):
         """
-        Removes an event from a user's public list by trimming event IDs.
+        Removes an event from a user's public list.
 
         :param id_event: Event ID to be removed
         :param id_list: List ID from which the event should be removed
         """
-        query = """UPDATE public_list_events
-                   SET event_ids = TRIM(BOTH ',' FROM REPLACE(CONCAT(',', TRIM(BOTH ',' FROM event_ids), ','), CONCAT(',', %s, ','), ','))
-                   WHERE id_list = %s"""
-        args = (id_event, id_list)
+        query = 'DELETE FROM public_list_items WHERE id_list = %s AND id_event = %s'
+        args = (id_list, id_event)
         await self.execute_query(query=query, args=args)
 
     async def remove_event_from_private_list(self, id_event: int, id_list: int):
         """
-        Removes an event from a user's private list by trimming event IDs.
+        Removes an event from a user's private list.
 
         :param id_event: Event ID to be removed
         :param id_list: List ID from which the event should be removed
         """
-        query = """UPDATE private_list_events
-                   SET event_ids = TRIM(BOTH ',' FROM REPLACE(CONCAT(',', TRIM(BOTH ',' FROM event_ids), ','), CONCAT(',', %s, ','), ','))
-                   WHERE id_list = %s"""
-        args = (id_event, id_list)
+        query = 'DELETE FROM private_list_items WHERE id_list = %s AND id_event = %s'
+        args = (id_list, id_event)
         await self.execute_query(query=query, args=args)
 
+    async def is_event_in_list(self, id_event: int, id_list: int, type_list: str = 'private') -> bool:
+        """
+        Checks whether an event is in a list, using the primary key of the membership table.
+
+        :param id_event: Event ID
+        :param id_list: List ID
+        :param type_list: Type of list (either 'private' or 'public')
+        :return: True if the event is in the list
+        """
+        query = f"SELECT EXISTS(SELECT 1 FROM {type_list}_list_items WHERE id_list = %s AND id_event = %s) AS in_list"
+        result = await self.execute_query(query=query, args=(id_list, id_event))
+        return bool(result[0]['in_list'])
+
     # Methods for retrieving lists
     async def get_privete_lists_events_by_tg_id(self, tg_id_user: int):
         """
@@ -894,12 +1570,80 @@ class ListEvents(AsyncDataBase):
 
         :param id_list: List ID
         :param type_list: Type of list (either 'private' or 'public')
-        :return: Event IDs from the specified list
+        :return: List of event IDs ordered by ID
         """
-        query = f"select event_ids from {type_list}_list_events where id_list = %s"
+        query = f"select id_event from {type_list}_list_items where id_list = %s order by id_event"
         args = (id_list,)
         result = await self.execute_query(query=query, args=args)
-        return result
+        return [row['id_event'] for row in result]
+
+    async def get_private_list_event_ids_by_tg_id(self, tg_id_user: int):
+        """
+        Retrieves the event IDs from the user's private list by their Telegram ID.
+
+        :param tg_id_user: Telegram user ID
+        :return: List of event IDs ordered by ID
+        """
+        query = """SELECT i.id_event FROM private_list_items i
+                   JOIN private_list_events l ON l.id_list = i.id_list
+                   JOIN users u ON u.id_user = l.id_user
+                   WHERE u.tg_id = %s
+                   ORDER BY i.id_event"""
+        result = await self.execute_query(query=query, args=(tg_id_user,))
+        return [row['id_event'] for row in result]
+
+    async def get_subscribers_by_events(self, list_ids_events: list):
+        """
+        Finds the users whose private lists contain any of the given events.
+        One query using the index on private_list_items.id_event, so changes made by any process are seen.
+
+        :param list_ids_events: List of event IDs
+        :return: Dictionary where key is the user's Telegram ID and value is the list of matching event IDs
+        """
+        list_ids_events = {int(id_event) for id_event in list_ids_events}
+        if not list_ids_events:
+            return {}
+
+        query = """SELECT u.tg_id, i.id_event FROM private_list_items i
+                   JOIN private_list_events l ON l.id_list = i.id_list
+                   JOIN users u ON u.id_user = l.id_user
+                   WHERE i.id_event IN %s"""
+        rows = await self.execute_query(query=query, args=(list_ids_events,))
+
+        subscribers = {}
+        for row in rows:
+            subscribers.setdefault(int(row['tg_id']), set()).add(row['id_event'])
+        return {tg_id: sorted(events) for tg_id, events in subscribers.items()}
+
+    async def migrate_csv_memberships(self):
+        """
+        One-shot migration of the legacy comma-separated columns (private_list_events.event_ids,
+        public_list_events.event_ids, users.favorites_private_lists) into the membership tables.
+        Runs only while the membership tables are empty and can safely be repeated.
+        """
+        counts = await self.execute_query(query="""SELECT (SELECT COUNT(*) FROM private_list_items) AS private_items,
+                                                          (SELECT COUNT(*) FROM public_list_items) AS public_items,
+                                                          (SELECT COUNT(*) FROM user_favorite_lists) AS favorites""")
+        counts = counts[0]
+
+        def parse_csv(value) -> list:
+            return [int(item) for item in str(value or '').split(',') if item.strip().isdigit()]
+
+        for type_list in ('private', 'public'):
+            if counts[f'{type_list}_items']:
+                continue
+            lists = await self.execute_query(query=f'select id_list, event_ids from {type_list}_list_events')
+            rows = [(row['id_list'], id_event) for row in lists for id_event in parse_csv(row['event_ids'])]
+            if rows:
+                await self.execute_many(query=f'INSERT IGNORE INTO {type_list}_list_items (id_list, id_event) VALUES (%s, %s)',
+                                        args_list=rows)
+
+        if not counts['favorites']:
+            users = await self.execute_query(query='select id_user, favorites_private_lists from users where favorites_private_lists is not null')
+            rows = [(row['id_user'], id_list) for row in users for id_list in parse_csv(row['favorites_private_lists'])]
+            if rows:
+                await self.execute_many(query='INSERT IGNORE INTO user_favorite_lists (id_user, id_list) VALUES (%s, %s)',
+                                        args_list=rows)
 
     async def get_list_by_secret_key(self, key: int):
         """
@@ -936,6 +1680,17 @@ class ListEvents(AsyncDataBase):
         info_user = await self.execute_query(query=info_user, args=(info_list[0]['id_user'],))
         return info_user
 
+# Background writer shared by all logging methods
+log_sink = LogSink(database=AsyncDataBase())
+
+
 async def check_tables():
     db = AsyncDataBase()
-    await db.init_tables()
\ No newline at end of file
+    await db.init_tables()
+
+    try:
+        await ListEvents().migrate_csv_memberships()
+    except Exception as ex:
+        print(f'Migration of list memberships failed: {ex}')
+
+    await db.add_unique_indexes()  # After the migration, so merged lists keep their events
\ No newline at end of file
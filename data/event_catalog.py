@@ -0,0 +1,266 @@
+import asyncio
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from data.async_database import Event, EVENT_CARD_COLUMNS, EVENT_DETAIL_COLUMNS, projection
+from TelegramBot.settings.config import CATALOG_REFRESH_INTERVAL
+
+# Columns kept in memory: the detail projection plus the change-tracking columns.
+# The heavy agenda and html_event columns stay in the database (see Event.get_event_fields).
+CATALOG_COLUMNS = EVENT_DETAIL_COLUMNS + ('date_add', 'date_update', 'type_update')
+
+
+@lru_cache(maxsize=256)
+def _like_regex(pattern: str) -> re.Pattern:
+    regex = ''.join('.*' if char == '%' else '.' if char == '_' else re.escape(char) for char in pattern)
+    return re.compile(regex, flags=re.IGNORECASE | re.DOTALL)
+
+
+def _like(value: Optional[str], pattern: str) -> bool:
+    """
+    Case-insensitive equivalent of MySQL `value LIKE pattern` ('%' and '_' wildcards).
+    """
+    if value is None:
+        return False
+    return _like_regex(pattern).fullmatch(str(value)) is not None
+
+
+def _parse_ids(list_ids_events) -> List[int]:
+    """
+    Converts a list of event IDs (ints or strings, possibly with empty items from CSV) into unique ints,
+    keeping the order of the first occurrences (search results are ordered by relevance).
+    """
+    return list(dict.fromkeys(int(id_event) for id_event in list_ids_events if str(id_event).strip().isdigit()))
+
+
+class EventCatalog(Event):
+    """
+    In-memory snapshot of the 'conference_events' table.
+
+    The table is loaded once at startup and then refreshed incrementally using the `date_add` / `date_update`
+    columns. Every refresh builds a new snapshot and swaps it in one assignment, so readers always see
+    a consistent catalog. The read methods of Event are served from memory while the catalog is loaded
+    and fall back to the database otherwise. `version` is increased every time the catalog changes.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.events: Dict[int, Dict] = {}
+        self.version = 0
+        self.loaded = False
+        self._watermark = None
+        self._max_id = 0
+        self._refresh_lock = asyncio.Lock()
+
+    # Loading and refreshing
+    async def load(self):
+        """
+        Loads the full catalog from the database.
+        """
+        async with self._refresh_lock:
+            query = f"select {projection(CATALOG_COLUMNS)} from conference_events"
+            rows = await self.execute_query(query=query)
+            self._swap({row['id_event']: row for row in rows}, rows)
+            self.loaded = True
+
+    async def refresh(self):
+        """
+        Fetches events added or updated since the last refresh and drops deleted events.
+        """
+        if not self.loaded:
+            return await self.load()
+
+        async with self._refresh_lock:
+            if self._watermark is None:
+                query = f"select {projection(CATALOG_COLUMNS)} from conference_events"
+                changed = await self.execute_query(query=query)
+            else:
+                query = f"""select {projection(CATALOG_COLUMNS)} from conference_events
+                            where date_add >= %s or date_update >= %s"""
+                changed = await self.execute_query(query=query, args=(self._watermark, self._watermark))
+
+            # Rows on the watermark boundary are fetched again, keep only real changes
+            changed = [row for row in changed if self.events.get(row['id_event']) != row]
+
+            ids = await self.execute_query(query='select id_event from conference_events')
+            ids = {row['id_event'] for row in ids}
+
+            if not changed and ids == set(self.events):
+                return
+
+            events = {id_event: event for id_event, event in self.events.items() if id_event in ids}
+            for row in changed:
+                events[row['id_event']] = row
+            self._swap(events, changed)
+
+    def _swap(self, events: Dict[int, Dict], changed_rows: List[Dict]):
+        for row in changed_rows:
+            for column in ('date_add', 'date_update'):
+                if row.get(column) is not None and (self._watermark is None or row[column] > self._watermark):
+                    self._watermark = row[column]
+        self.events = events
+        self._max_id = max(events, default=0)
+        self.version += 1
+
+    # Read methods served from memory
+    def filter_existing_ids(self, list_ids_events) -> List[int]:
+        """
+        Returns the unique event IDs in their original order, without IDs of events that are not in the catalog.
+        Until the catalog is loaded the IDs are only normalized.
+
+        :param list_ids_events: List of event IDs (ints or strings)
+        :return: List of event IDs in the order of list_ids_events
+        """
+        ids = _parse_ids(list_ids_events)
+        if not self.loaded:
+            return ids
+        events = self.events
+        return [id_event for id_event in ids if id_event in events or id_event > self._max_id]
+
+    async def get_all_events(self, columns: tuple = EVENT_CARD_COLUMNS):
+        """
+        Retrieves all events.
+
+        :param columns: Columns to select when they are not all in the catalog
+        :return: List of all events
+        """
+        if not self.loaded or not set(columns) <= set(CATALOG_COLUMNS):
+            return await super().get_all_events(columns=columns)
+        return list(self.events.values())
+
+    async def get_all_urls_events(self):
+        """
+        Retrieves the URLs of all events.
+
+        :return: List of event URLs
+        """
+        if not self.loaded:
+            return await super().get_all_urls_events()
+        return [event['url_event'] for event in self.events.values()]
+
+    async def get_info_all_events_by_tag(self, tag: str):
+        """
+        Retrieves all events that match a specific tag, excluding main events.
+
+        :param tag: Tag to search for
+        :return: List of events that match the tag
+        """
+        if not self.loaded:
+            return await super().get_info_all_events_by_tag(tag=tag)
+        return [event for event in self.events.values()
+                if _like(event['tags_event'], f"%{tag}%") and not _like(event['name_event'], '%EthCC Main Event:%')]
+
+    async def get_info_many_events(self, list_ids_events: list, columns: tuple = EVENT_CARD_COLUMNS):
+        """
+        Retrieves information for multiple events based on their IDs, ordered by ID.
+        Events newer than the snapshot (added after the last refresh) are read from the database.
+
+        :param list_ids_events: List of event IDs
+        :param columns: Columns to select from the database
+        :return: List of events
+        """
+        ids = sorted(_parse_ids(list_ids_events))
+        if not self.loaded or not set(columns) <= set(CATALOG_COLUMNS):
+            return await super().get_info_many_events(list_ids_events=ids, columns=columns) if ids else []
+
+        events = self.events
+        result = [events[id_event] for id_event in ids if id_event in events]
+        missing = [id_event for id_event in ids if id_event not in events and id_event > self._max_id]
+        if missing:
+            result += await super().get_info_many_events(list_ids_events=missing, columns=columns)
+            result.sort(key=lambda event: event['id_event'])
+        return result
+
+    async def get_info_event_by_id(self, id_event: int, columns: tuple = EVENT_DETAIL_COLUMNS):
+        """
+        Retrieves information for a specific event based on its ID.
+
+        :param id_event: Event ID
+        :param columns: Columns to select from the database
+        :return: Event details
+        """
+        event = self.events.get(int(id_event)) if self.loaded else None
+        if event is None or not set(columns) <= event.keys():
+            return await super().get_info_event_by_id(id_event=id_event, columns=columns)
+        return event
+
+    async def find_events_by_tag(self, tags: list):
+        """
+        Finds events that match any of the provided tags (same rules as Event.find_events_by_tag).
+
+        :param tags: List of tags to search for
+        :return: List of events that match the tags
+        """
+        if not self.loaded:
+            return await super().find_events_by_tag(tags=tags)
+
+        if 'AI' in tags:
+            patterns = ["%, AI%"]
+        else:
+            patterns = [f"%{tag}%" if tag != 'Sport' else tag for tag in tags]
+        return [event for event in self.events.values()
+                if any(_like(event['tags_event'], pattern) for pattern in patterns)]
+
+    async def main_events_find_by_location(self, location: str):
+        """
+        Finds main events by location.
+
+        :param location: Location to search for
+        :return: List of events in the specified location
+        """
+        if not self.loaded:
+            return await super().main_events_find_by_location(location=location)
+        return [event for event in self.events.values()
+                if _like(event['name_event'], '%[IMPACT]%') and _like(event['location_event'], f"%{location}%")]
+
+    async def main_events_find_by_day(self, day: str):
+        """
+        Finds main events by day.
+
+        :param day: Day to search for
+        :return: List of events on the specified day
+        """
+        if not self.loaded:
+            return await super().main_events_find_by_day(day=day)
+        return [event for event in self.events.values()
+                if _like(event['name_event'], '%[IMPACT]%') and _like(event['date_event'], f"%{day}%")]
+
+    async def main_events_find_by_location_and_day(self, location: str, day: str):
+        """
+        Finds main events by both location and day.
+
+        :param location: Location to search for
+        :param day: Day to search for
+        :return: List of events that match both location and day
+        """
+        if not self.loaded:
+            return await super().main_events_find_by_location_and_day(location=location, day=day)
+        return [event for event in self.events.values()
+                if _like(event['name_event'], '%[IMPACT]%') and _like(event['date_event'], f"%{day}%")
+                and _like(event['location_event'], f"%{location}%")]
+
+    # Writes go to the database and are picked up immediately
+    async def update_info(self, url_event: str, column: str, value: str):
+        await super().update_info(url_event=url_event, column=column, value=value)
+        await self.load()
+
+    async def update_info_by_name(self, name_event: str, column: str, value: str):
+        await super().update_info_by_name(name_event=name_event, column=column, value=value)
+        await self.load()
+
+
+# Shared catalog used by the handlers instead of Event()
+event_catalog = EventCatalog()
+
+
+async def start_refresh_catalog():
+    """
+    Periodically refreshes the event catalog.
+    """
+    while True:
+        await asyncio.sleep(CATALOG_REFRESH_INTERVAL)
+        try:
+            await event_catalog.refresh()
+        except Exception as ex:
+            print(f'Event catalog refresh failed: {ex}')
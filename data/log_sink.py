@@ -0,0 +1,114 @@
+import asyncio
+from collections import defaultdict
+from typing import Optional
+
+from TelegramBot.settings.config import LOG_QUEUE_MAXSIZE, LOG_BATCH_SIZE, LOG_FLUSH_INTERVAL
+
+# Put into the queue by stop(): the writer flushes its batch and exits
+_STOP = object()
+
+
+class LogSink:
+    """
+    Background writer for log rows.
+
+    Log calls only put a row into a bounded asyncio queue and return immediately, so the user-visible
+    request path never waits for a database write. A writer task drains the queue and inserts the rows
+    with one `executemany` per query, either when `batch_size` rows are collected or every `flush_interval` seconds.
+    When the queue is full new rows are dropped and counted in `dropped`.
+
+    :param database: Database instance providing `execute_many(query, args_list)`
+    """
+
+    def __init__(self, database, maxsize: int = LOG_QUEUE_MAXSIZE, batch_size: int = LOG_BATCH_SIZE,
+                 flush_interval: float = LOG_FLUSH_INTERVAL):
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0  # Rows rejected because the queue was full
+        self.failed = 0  # Rows lost because the database write failed
+        self.written = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def put(self, query: str, args: tuple) -> None:
+        """
+        Schedules a row to be written. Never blocks.
+
+        :param query: INSERT query with placeholders
+        :param args: Values for the placeholders
+        """
+        try:
+            self.queue.put_nowait((query, args))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def start(self) -> None:
+        """
+        Starts the writer task. Must be called from a running event loop.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the writer task and flushes every row still in the queue.
+        The writer is stopped with a sentinel rather than cancelled, so the batch it is collecting
+        or writing is not lost.
+        """
+        if self._task is not None:
+            if not self._task.done():
+                await self.queue.put(_STOP)
+                await self._task
+            self._task = None
+
+        while not self.queue.empty():
+            await self._flush(self._take_batch())
+
+    def stats(self) -> dict:
+        """
+        Returns the counters of the sink for monitoring.
+        """
+        return {'queued': self.queue.qsize(), 'written': self.written, 'dropped': self.dropped, 'failed': self.failed}
+
+    def _take_batch(self) -> list:
+        batch = []
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            # Wait for the first row, then collect whatever else arrives until the batch is full or the interval ends
+            row = await self.queue.get()
+            if row is _STOP:
+                return
+            batch = [row]
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is _STOP:
+                    await self._flush(batch)
+                    return
+                batch.append(row)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list) -> None:
+        rows_by_query = defaultdict(list)
+        for query, args in batch:
+            rows_by_query[query].append(args)
+
+        for query, rows in rows_by_query.items():
+            try:
+                await self.database.execute_many(query=query, args_list=rows)
+                self.written += len(rows)
+            except Exception as ex:
+                self.failed += len(rows)
+                print(f'Log sink: failed to write {len(rows)} rows: {ex}')
@@ -0,0 +1,102 @@
+import re
+
+from TelegramBot.settings.config import GENERATED_SQL_LIMIT, GENERATED_SQL_MAX_TIME_MS
+
+# String literals ('...' or "...", with backslash or doubled-quote escapes)
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"", re.DOTALL)
+
+# Anything that writes, reads other data, sleeps or changes the session
+_FORBIDDEN = re.compile(
+    r'\b(insert|update|delete|drop|alter|create|replace|truncate|rename|grant|revoke|set|call|handler|lock|unlock|'
+    r'into|outfile|dumpfile|union|load_file|sleep|benchmark|get_lock|information_schema|mysql|performance_schema|'
+    r'sys)\b',
+    re.IGNORECASE
+)
+
+_TABLE_REFERENCE = re.compile(r'\b(?:from|join)\s+([`\w.]+|\()', re.IGNORECASE)
+_COMMA_JOIN = re.compile(r'\bfrom\s+[`\w.]+(?:\s+(?:as\s+)?\w+)?\s*,', re.IGNORECASE)
+_TRAILING_LIMIT = re.compile(r'\blimit\s+(\d+)(?:\s*,\s*(\d+)|\s+offset\s+(\d+))?\s*$', re.IGNORECASE)
+
+
+class UnsafeQuery(Exception):
+    """
+    Raised when a generated SQL statement is not allowed to run.
+    """
+
+
+def _mask_literals(sql: str) -> str:
+    """
+    Replaces the content of string literals with underscores, keeping positions, so keywords
+    inside user-provided values are not mistaken for SQL.
+    """
+    return _STRING_LITERAL.sub(lambda match: match.group(0)[0] + '_' * (len(match.group(0)) - 2)
+                               + match.group(0)[-1], sql)
+
+
+def _top_level_from(masked: str) -> int:
+    """
+    Returns the position of the FROM of the outer SELECT.
+    """
+    depth = 0
+    for match in re.finditer(r'\(|\)|\bfrom\b', masked, re.IGNORECASE):
+        token = match.group(0)
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        elif depth == 0:
+            return match.start()
+    raise UnsafeQuery('no FROM clause')
+
+
+def guard_generated_sql(sql: str, table: str = 'conference_events', limit: int = GENERATED_SQL_LIMIT,
+                        max_time_ms: int = GENERATED_SQL_MAX_TIME_MS) -> str:
+    """
+    Checks an SQL statement written by the LLM and rewrites it into a bounded query.
+
+    Only a single SELECT reading from `table` is allowed. The projection is replaced with `id_event`,
+    the LIMIT is capped at `limit` and a MAX_EXECUTION_TIME hint makes the server stop the query
+    after `max_time_ms`.
+
+    :param sql: Generated SQL statement
+    :param table: The only table the statement may read
+    :param limit: Maximum number of rows
+    :param max_time_ms: Maximum execution time in milliseconds
+    :return: Rewritten SQL statement
+    :raises UnsafeQuery: If the statement is not allowed
+    """
+    sql = sql.strip().rstrip(';').strip()
+    masked = _mask_literals(sql)
+
+    if not re.match(r'select\b', masked, re.IGNORECASE):
+        raise UnsafeQuery('not a SELECT')
+    if ';' in masked:
+        raise UnsafeQuery('multiple statements')
+    if re.search(r'--|#|/\*', masked):
+        raise UnsafeQuery('comments are not allowed')
+    forbidden = _FORBIDDEN.search(masked)
+    if forbidden:
+        raise UnsafeQuery(f'forbidden keyword {forbidden.group(0).upper()}')
+
+    tables = [reference.strip('`').lower() for reference in _TABLE_REFERENCE.findall(masked)]
+    if not tables or any(reference != table for reference in tables) or _COMMA_JOIN.search(masked):
+        raise UnsafeQuery(f'only {table} can be read')
+
+    # Keep everything from the outer FROM, replace the projection
+    body = sql[_top_level_from(masked):]
+    masked_body = masked[len(masked) - len(body):]
+
+    trailing_limit = _TRAILING_LIMIT.search(masked_body)
+    if trailing_limit:
+        body = body[:trailing_limit.start()].rstrip()
+        if trailing_limit.group(2) is not None:  # LIMIT offset, count
+            offset, count = int(trailing_limit.group(1)), int(trailing_limit.group(2))
+        else:
+            offset, count = int(trailing_limit.group(3) or 0), int(trailing_limit.group(1))
+        limit_clause = f'LIMIT {min(count, limit)}' + (f' OFFSET {offset}' if offset else '')
+    elif re.search(r'\blimit\b', masked_body, re.IGNORECASE):
+        raise UnsafeQuery('unsupported LIMIT')
+    else:
+        limit_clause = f'LIMIT {limit}'
+
+    return f'SELECT /*+ MAX_EXECUTION_TIME({int(max_time_ms)}) */ id_event {body} {limit_clause}'
@@ -0,0 +1,110 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, Optional, Tuple
+
+from TelegramBot.settings.config import USER_CACHE_TTL, USER_CACHE_MAXSIZE, USER_CACHE_MISSING_TTL
+
+
+class UserCache:
+    """
+    In-process cache of user profiles (rows of the 'users' table) keyed by Telegram ID.
+
+    Entries expire after `ttl` seconds and the least recently used entry is evicted
+    once `maxsize` entries are stored. UserDB writes through this cache on every change,
+    so lookups on the hot path (mode checks) do not need a database round-trip.
+    Users who are not in the table (updates sent before /start) are remembered as well,
+    for `missing_ttl` seconds, so they do not cost a query per update either.
+    """
+
+    def __init__(self, ttl: float = USER_CACHE_TTL, maxsize: int = USER_CACHE_MAXSIZE,
+                 missing_ttl: float = USER_CACHE_MISSING_TTL):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.missing_ttl = missing_ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def lookup(self, tg_id: int) -> Tuple[bool, Optional[Dict]]:
+        """
+        Looks the user up in the cache.
+
+        :param tg_id: Telegram user ID
+        :return: Tuple of whether the user is cached and their profile (None for a user known to be missing)
+        """
+        key = str(tg_id)
+        item = self._data.get(key)
+        if item is None:
+            return False, None
+
+        expires_at, profile = item
+        if expires_at < monotonic():
+            del self._data[key]
+            return False, None
+
+        self._data.move_to_end(key)
+        return True, profile
+
+    def get(self, tg_id: int) -> Optional[Dict]:
+        """
+        Returns the cached profile of the user or None if it is missing or expired.
+
+        :param tg_id: Telegram user ID
+        :return: User profile or None
+        """
+        return self.lookup(tg_id)[1]
+
+    def set(self, tg_id: int, profile: Dict) -> None:
+        """
+        Stores the profile of the user, evicting the least recently used entries if needed.
+
+        :param tg_id: Telegram user ID
+        :param profile: User profile (row of the 'users' table)
+        """
+        self._store(tg_id, self.ttl, profile)
+
+    def set_missing(self, tg_id: int) -> None:
+        """
+        Remembers that the user is not in the 'users' table.
+
+        :param tg_id: Telegram user ID
+        """
+        self._store(tg_id, self.missing_ttl, None)
+
+    def _store(self, tg_id: int, ttl: float, profile: Optional[Dict]) -> None:
+        key = str(tg_id)
+        self._data[key] = (monotonic() + ttl, profile)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def update(self, tg_id: int, **fields) -> None:
+        """
+        Updates fields of a cached profile. Does nothing if the user is not cached.
+
+        :param tg_id: Telegram user ID
+        :param fields: Columns and their new values
+        """
+        profile = self.get(tg_id)
+        if profile is not None:
+            self.set(tg_id, {**profile, **fields})
+
+    def invalidate(self, tg_id: int) -> None:
+        """
+        Removes the user from the cache.
+
+        :param tg_id: Telegram user ID
+        """
+        self._data.pop(str(tg_id), None)
+
+    def disable(self) -> None:
+        """
+        Stops caching, so every lookup reads the database. Used when several bot processes change the same users.
+        """
+        self.maxsize = 0
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Shared cache used by UserDB and the mode middleware
+user_cache = UserCache()
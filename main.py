@@ -1,14 +1,34 @@
+import time
+STARTED_AT = time.perf_counter()  # Before the bot package is imported
+
 import asyncio
 from TelegramBot import bot
-from data.async_database import check_tables
+from data.async_database import check_tables, close_pool, log_sink
+from TelegramBot.utils.gaianet_client import gaianet_client
+from TelegramBot.utils.fsm_storage import fsm_storage
+from TelegramBot.settings.config import STARTUP_IMPORT_BUDGET
+
+IMPORT_TIME = time.perf_counter() - STARTED_AT
 
 async def main():
     """
     Main function to start the bot after ensuring that the necessary database tables are set up.
     It first checks and creates tables if they do not exist, then runs the bot.
+    Pending FSM states and log rows are flushed and the shared database pool and Gaianet connections are closed
+    when the bot stops.
     """
-    await check_tables()  # Ensure tables are created
-    await bot.main()  # Run bot
+    print(f'Bot package imported in {IMPORT_TIME:.2f} s')
+    if IMPORT_TIME > STARTUP_IMPORT_BUDGET:
+        print(f'Warning: import took longer than the startup budget of {STARTUP_IMPORT_BUDGET} s')
+
+    try:
+        await check_tables()  # Ensure tables are created
+        await bot.main()  # Run bot
+    finally:
+        await fsm_storage.close()  # Write pending FSM states
+        await log_sink.stop()  # Flush pending log rows
+        await close_pool()  # Release all database connections
+        await gaianet_client.close()  # Release Gaianet connections
 
 if __name__ == '__main__':
     """
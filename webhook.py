@@ -0,0 +1,104 @@
+import asyncio
+
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+
+from TelegramBot import bot as telegram_bot
+from TelegramBot.settings.config import BOT_TOKEN, WEBHOOK_BASE_URL, WEBHOOK_PATH, WEBHOOK_SECRET, WEBHOOK_HOST, \
+    WEBHOOK_PORT, UPDATE_LOCK_TIMEOUT
+from TelegramBot.middleware.dedup_updates import UpdateDedupMiddleware, start_clean_processed_updates
+from TelegramBot.utils.admin_alerts import start_admin_alerts
+from TelegramBot.utils.gaianet_client import gaianet_client
+from TelegramBot.utils.leader import run_as_leader
+from TelegramBot.utils.update_isolation import update_isolation
+from TelegramBot.utils.fsm_storage import fsm_storage, BatchedFSMStorage
+from TelegramBot.conference_mode.utils.result_store import result_store
+from data.user_cache import user_cache
+from data.async_database import check_tables, close_pool, log_sink
+from data.event_catalog import event_catalog, start_refresh_catalog
+
+
+async def on_startup(bot: Bot, dispatcher: Dispatcher):
+    """
+    Prepares the worker: creates the tables, loads the event catalog, registers the webhook
+    and starts the background jobs. Notifications and summary generation run only in the elected leader.
+
+    :param bot: The bot instance.
+    :param dispatcher: The dispatcher instance.
+    """
+    await check_tables()  # Ensure tables are created
+    log_sink.start()  # Background writer for log rows
+    await event_catalog.load()  # Load the event catalog into memory
+
+    # Every worker registers the same webhook, the call is idempotent
+    await bot.set_webhook(url=f'{WEBHOOK_BASE_URL}{WEBHOOK_PATH}', secret_token=WEBHOOK_SECRET,
+                          allowed_updates=dispatcher.resolve_used_update_types())
+
+    dispatcher['background_tasks'] = [
+        asyncio.create_task(start_refresh_catalog()),
+        asyncio.create_task(start_admin_alerts(bot=bot)),
+        asyncio.create_task(run_as_leader(
+            lambda: telegram_bot.leader_jobs(bot=bot) + [start_clean_processed_updates()]
+        )),
+    ]
+    print('Bot rolling (webhook)')
+
+
+async def on_shutdown(dispatcher: Dispatcher):
+    """
+    Stops the background jobs, writes pending FSM states and log rows and closes the database pool and Gaianet connections.
+    The webhook is left registered for the other workers.
+
+    :param dispatcher: The dispatcher instance.
+    """
+    tasks = dispatcher.get('background_tasks', [])
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    await fsm_storage.close()  # Write pending FSM states
+    await update_isolation.close()  # Release the connections of the user locks
+    await log_sink.stop()  # Flush pending log rows
+    await close_pool()  # Release all database connections
+    await gaianet_client.close()  # Release Gaianet connections
+
+
+def create_app() -> web.Application:
+    """
+    Creates the aiohttp application of one webhook worker. Workers keep no state that the others need,
+    so several of them can run behind a load balancer: FSM states and result sets are stored in MySQL,
+    user profiles are read from the database on every update and the updates of one user are
+    serialized across the workers by a MySQL lock.
+
+    :return: The aiohttp application
+    """
+    if not WEBHOOK_BASE_URL or not WEBHOOK_SECRET:
+        raise RuntimeError('WEBHOOK_BASE_URL and WEBHOOK_SECRET must be set for the webhook mode')
+    if not isinstance(fsm_storage, BatchedFSMStorage):
+        raise RuntimeError("FSM_STORAGE must be 'mysql' for the webhook mode")
+    if not result_store.is_shared:
+        raise RuntimeError("RESULT_STORE_BACKEND must be 'mysql' for the webhook mode")
+    user_cache.disable()  # Another worker may change the user at any moment
+    # Telegram sends up to 40 updates at once, so two workers may get updates of the same user
+    update_isolation.use_process_locks(timeout=UPDATE_LOCK_TIMEOUT)
+
+    bot = Bot(BOT_TOKEN)
+    dp = Dispatcher(storage=fsm_storage, events_isolation=update_isolation)
+    telegram_bot.setup_dispatcher(dp=dp)
+    dp.update.outer_middleware(UpdateDedupMiddleware())  # Telegram retries may reach another worker
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+
+    app = web.Application()
+    # Requests without the secret token in the X-Telegram-Bot-Api-Secret-Token header are rejected
+    SimpleRequestHandler(dispatcher=dp, bot=bot, secret_token=WEBHOOK_SECRET).register(app, path=WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+if __name__ == '__main__':
+    """
+    Entry point for running one webhook worker.
+    """
+    web.run_app(create_app(), host=WEBHOOK_HOST, port=WEBHOOK_PORT)